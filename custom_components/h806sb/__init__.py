@@ -5,36 +5,119 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import Platform
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN, TRACK_INTERVAL
-from .controller import LedController
-from datetime import timedelta
+from .const import (
+    DOMAIN,
+    DATA_FLEET,
+    DATA_SCANNER,
+    DATA_TRANSPORT,
+    CONF_AIRTIME_RATE,
+    CONF_CAPTURE_PACKETS,
+    CONF_CONFIRM_COMMANDS,
+    CONF_FAST_PROBE_INTERVAL,
+    CONF_MAX_PROBE_INTERVAL,
+    CONF_MIN_COMMAND_INTERVAL,
+    CONF_PROBE_INTERVAL,
+    CONF_TRACE_COMMANDS,
+)
+from .cache import async_get_device_cache
+from .endpoint import async_get_transport
+from .pyh806sb.airtime import DEFAULT_AIRTIME_RATE, AirtimeLimiter
+from .pyh806sb.capture import PacketCapture
+from .pyh806sb.codec import normalize_serial
+from .pyh806sb.controller import LedController
+from .coordinator import H806SBCoordinator, async_get_fleet
+from .pyh806sb.pipeline import DEFAULT_MIN_COMMAND_INTERVAL
+from .pyh806sb.schedule import (
+    DEFAULT_FAST_PROBE_INTERVAL,
+    DEFAULT_MAX_PROBE_INTERVAL,
+    DEFAULT_PROBE_INTERVAL,
+)
+from .scanner import async_start_scanner
+from .services import async_setup_services
+from .pyh806sb.tracing import TraceBuffer
+from .pyh806sb.transport import H806SBTransport
 
 _LOGGER = logging.getLogger(__name__)
-_PLATFORMS: list[str] = ["light"]
+_PLATFORMS: list[str] = ["light", "sensor"]
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Setting integration by configuration.yaml."""
+    async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Setting up from a config entry."""
     
-    controller = LedController(host=entry.data["host"])
-
-    # Create coordinator for periodically check
-    coordinator = H806SBCoordinator(hass, controller)
-    await coordinator.async_config_entry_first_refresh()
-
     config = {**entry.data, **entry.options}
     if entry.options:
         hass.config_entries.async_update_entry(entry, data=config, options={})
 
+    transport = await async_get_transport(hass)
+    if DATA_SCANNER not in hass.data:
+        # Runs while entries are loaded: it shares their endpoint
+        hass.data[DATA_SCANNER] = async_start_scanner(hass)
+    _async_update_capture(hass, transport)
+    controller = LedController(
+        host=config["host"],
+        transport=transport,
+        min_command_interval=config.get(CONF_MIN_COMMAND_INTERVAL, DEFAULT_MIN_COMMAND_INTERVAL),
+        confirm_commands=config.get(CONF_CONFIRM_COMMANDS, True),
+    )
+    if config.get(CONF_TRACE_COMMANDS, False):
+        controller.tracer = TraceBuffer()
+    serial = config.get("serial_number")
+    if serial:
+        controller.set_serial_number(serial)
+        # Typed serials may differ in case and padding from discovered ones
+        serial = normalize_serial(serial)
+        if entry.unique_id != serial:
+            hass.config_entries.async_update_entry(entry, unique_id=serial)
+
+    cache = await async_get_device_cache(hass)
+    cached = cache.get(serial) if serial else None
+    if cached and cached.get("rtt"):
+        # Start from the last known round trip instead of the 1 s default
+        controller.rtt.sample(cached["rtt"])
+
+    # One coordinator per entry, probed by the fleet-wide sweep on its own schedule
+    fleet = async_get_fleet(hass)
+    schedule = fleet.create_schedule(
+        interval=config.get(CONF_PROBE_INTERVAL, DEFAULT_PROBE_INTERVAL),
+        fast_interval=config.get(CONF_FAST_PROBE_INTERVAL, DEFAULT_FAST_PROBE_INTERVAL),
+        max_interval=config.get(CONF_MAX_PROBE_INTERVAL, DEFAULT_MAX_PROBE_INTERVAL),
+    )
+    coordinator = H806SBCoordinator(hass, controller, schedule, entry)
+    # Don't block startup on the network: start from the availability the
+    # device had when last heard of, until the next fleet sweep probes it
+    coordinator.async_set_updated_data({"available": bool(cached and cached.get("available"))})
+    schedule.probe_now()
+    fleet.add(entry.entry_id, coordinator)
+
+    if serial:
+        @callback
+        def _async_cache_availability(available: bool) -> None:
+            if available:
+                cache.async_update(
+                    serial,
+                    host=controller._host,
+                    rtt=controller.rtt.srtt,
+                    seen=True,
+                )
+            else:
+                cache.async_update(serial, lost=True)
+
+        cache.async_update(serial, host=config["host"], name=config.get("name"))
+        entry.async_on_unload(controller.add_availability_listener(_async_cache_availability))
+
     _LOGGER.debug("Initializing H806SB controller entry (%s)", config)
 
+    if serial:
+        _async_migrate_unique_id(hass, entry, config["host"], config["serial_number"])
+
     # Default config creation
     hass.data.setdefault(DOMAIN, {})
     
@@ -42,41 +125,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         "controller": controller,
         "coordinator": coordinator
     }
+    _async_update_limiter(hass, transport)
 
     """Settings integration by UI."""
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
-class H806SBCoordinator(DataUpdateCoordinator):
-    """Coordiantor for periodically check."""
-    
-    def __init__(self, hass, controller):
-        """Initialize."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="H806SB Device Status",
-            update_interval=TRACK_INTERVAL
-        )
-        self.controller = controller
-        
-    async def _async_update_data(self):
-        """Checking the available devices."""
-        try:
-            available = await self.controller.async_check_availability()
-            _LOGGER.debug(f"available:{available}")
-            return {"available": available}
-        except Exception as err:
-            _LOGGER.error("Error checking device availability: %s", err)
-            raise UpdateFailed(f"Error checking device: {err}")
+@callback
+def _async_update_capture(hass: HomeAssistant, transport: H806SBTransport) -> None:
+    """Capture packets while any entry has the option enabled."""
+    enabled = any(
+        entry.data.get(CONF_CAPTURE_PACKETS, False)
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+    if enabled and transport.capture is None:
+        transport.capture = PacketCapture()
+    elif not enabled:
+        transport.capture = None
+
+@callback
+def _async_update_limiter(hass: HomeAssistant, transport: H806SBTransport) -> None:
+    """Pace each subnet at the airtime rate of the loaded entries in it (0 = unlimited)."""
+    rates = {}
+    for entry_id, data in hass.data.get(DOMAIN, {}).items():
+        if entry := hass.config_entries.async_get_entry(entry_id):
+            rates[data["controller"].host] = entry.data.get(CONF_AIRTIME_RATE, DEFAULT_AIRTIME_RATE)
+    if transport.limiter is None:
+        transport.limiter = AirtimeLimiter()
+    transport.limiter.set_rates(rates)
+
+@callback
+def _async_migrate_unique_id(hass: HomeAssistant, entry: ConfigEntry, host: str, serial: str) -> None:
+    """Key the light by serial instead of host, which can change."""
+    registry = er.async_get(hass)
+    old_unique_id = f"h806sb_{host}"
+    if entity_id := registry.async_get_entity_id("light", DOMAIN, old_unique_id):
+        registry.async_update_entity(entity_id, new_unique_id=f"h806sb_{serial.lower()}")
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload when options were changed (setup moves them into data)."""
+    if entry.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+    elif transport := hass.data.get(DATA_TRANSPORT):
+        # A relocated device may have moved to another subnet
+        _async_update_limiter(hass, transport)
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget a removed device."""
+    if serial := entry.data.get("serial_number"):
+        cache = await async_get_device_cache(hass)
+        cache.async_remove(normalize_serial(serial))
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Upload integrations."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, _PLATFORMS):
         # Remove data of integration
-        hass.data[DOMAIN].pop(entry.entry_id)
-        # In case last integration - clear domain
-        if not hass.data[DOMAIN]:
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DATA_FLEET].remove(entry.entry_id)
+        await data["coordinator"].async_shutdown()
+        await data["controller"].async_close()
+        # Re-rate the subnets of the remaining entries, or clear the domain after the last one
+        if hass.data[DOMAIN]:
+            _async_update_limiter(hass, hass.data[DATA_TRANSPORT])
+        else:
             hass.data.pop(DOMAIN)
+            hass.data.pop(DATA_FLEET, None)
+            if stop_scanner := hass.data.pop(DATA_SCANNER, None):
+                stop_scanner()
+            if transport := hass.data.pop(DATA_TRANSPORT, None):
+                transport.close()
     return unload_ok
\ No newline at end of file
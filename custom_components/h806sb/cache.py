@@ -0,0 +1,89 @@
+"""Persistent cache of known H806SB devices."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_CACHE, DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.devices"
+STORAGE_VERSION = 1
+# Seconds between writes; traffic only touches the in-memory copy
+SAVE_DELAY = 60
+
+
+class H806SBDeviceCache:
+    """Last known address, name, last-seen time, RTT and availability of every device, by serial."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        if (data := await self._store.async_load()) is not None:
+            self._devices = data.get("devices", {})
+
+    @property
+    def devices(self) -> dict[str, dict[str, Any]]:
+        return self._devices
+
+    def get(self, serial: str) -> dict[str, Any] | None:
+        return self._devices.get(serial)
+
+    @callback
+    def async_update(
+        self,
+        serial: str,
+        *,
+        host: str | None = None,
+        name: str | None = None,
+        rtt: float | None = None,
+        seen: bool = False,
+        lost: bool = False,
+    ) -> None:
+        """Update a device; seen means it answered just now, lost that it stopped."""
+        device = self._devices.setdefault(serial, {})
+        if host is not None:
+            device["host"] = host
+        if name is not None:
+            device["name"] = name
+        if rtt is not None:
+            device["rtt"] = rtt
+        if seen:
+            device["last_seen"] = time.time()
+            device["available"] = True
+        elif lost:
+            device["available"] = False
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, serial: str) -> None:
+        if self._devices.pop(serial, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        # Rescheduling on every change would postpone the write forever
+        # under steady traffic, so only the first change arms the timer
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_scheduled = False
+        return {"devices": self._devices}
+
+
+@singleton(DATA_CACHE)
+async def async_get_device_cache(hass: HomeAssistant) -> H806SBDeviceCache:
+    """Return the device cache, loading it from storage once."""
+    cache = H806SBDeviceCache(hass)
+    await cache.async_load()
+    return cache
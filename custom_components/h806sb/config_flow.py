@@ -5,15 +5,33 @@ from homeassistant.helpers.selector import selector, SelectOptionDict
 import voluptuous as vol
 import logging
 
-from .discovery import H806SBDiscovery
-from .controller import LedController
+from .cache import async_get_device_cache
+from .scanner import async_scan
 from .const import (
     DOMAIN, 
     CONFIG_VERSION, 
     CONF_ACTION,
+    CONF_AIRTIME_RATE,
+    CONF_CAPTURE_PACKETS,
     CONF_AUTO_DISCOVERY,
     CONF_MANUAL_SETUP,
+    CONF_CONFIRM_COMMANDS,
+    CONF_FAST_PROBE_INTERVAL,
+    CONF_MAX_PROBE_INTERVAL,
+    CONF_MIN_COMMAND_INTERVAL,
+    CONF_PROBE_INTERVAL,
+    CONF_QUEUE_OFFLINE,
+    CONF_RECONCILE_STATE,
+    CONF_TRACE_COMMANDS,
     )
+from .pyh806sb.airtime import DEFAULT_AIRTIME_RATE
+from .pyh806sb.codec import normalize_serial
+from .pyh806sb.pipeline import DEFAULT_MIN_COMMAND_INTERVAL
+from .pyh806sb.schedule import (
+    DEFAULT_FAST_PROBE_INTERVAL,
+    DEFAULT_MAX_PROBE_INTERVAL,
+    DEFAULT_PROBE_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,19 +45,20 @@ class H806SBFlowHandler(config_entries.ConfigFlow):
     """Config flow for H806SB."""
 
     VERSION = CONFIG_VERSION
-    CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
+    CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
     def __init__(self):
         """Initialize the config flow."""
         self.discovered_device = None
+        self.discovered_devices = {}
         self._errors = {}
 
     @staticmethod
     @callback
-    def async_get_option_flow(config_entry):
+    def async_get_options_flow(config_entry):
         """H806SB option callback."""
         _LOGGER.debug(f"GetOptionFlow:{config_entry}")
-        return H806SBOptionsFlowHandler(config_entry)
+        return H806SBOptionsFlowHandler()
 
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
@@ -68,20 +87,64 @@ class H806SBFlowHandler(config_entries.ConfigFlow):
 
     async def async_step_auto_discovery(self, user_input=None):
         """Automatic deiscovery step."""
-        device = await self.async_discover_devices()
-        if not device:
+        devices = await self.async_discover_devices()
+        cache = await async_get_device_cache(self.hass)
+        for device in devices:
+            cache.async_update(device["serial"], host=device["ip"], name=device["name"], seen=True)
+        # Devices seen before that didn't answer this time can still be picked
+        found = {device["serial"] for device in devices}
+        devices += [
+            {"ip": cached["host"], "serial": normalize_serial(serial), "name": cached.get("name", "H806SB")}
+            for serial, cached in cache.devices.items()
+            if normalize_serial(serial) not in found and "host" in cached
+        ]
+        configured = self._async_current_ids()
+        self.discovered_devices = {
+            device["serial"]: device
+            for device in devices
+            if device["serial"] not in configured
+        }
+        if not self.discovered_devices:
+            if devices:
+                return self.async_abort(reason="already_configured")
             return self.async_abort(reason="no_devices_found")
+        return await self.async_step_pick_device()
 
-        controller = LedController(host=device["ip"])
-        
-        try:
+    async def async_step_pick_device(self, user_input=None):
+        """Selecting one of the discovered devices."""
+        if user_input is not None:
+            device = self.discovered_devices[user_input["device"]]
             await self.async_set_unique_id(device["serial"])
             self._abort_if_unique_id_configured()
             # memorizing for future step
             self.discovered_device = device
             return await self.async_step_confirm()
-        finally:
-            await controller.async_close()
+
+        options = [
+            SelectOptionDict(
+                value=serial,
+                label=f"{device['name']} ({device['ip']})",
+            )
+            for serial, device in self.discovered_devices.items()
+        ]
+        return self.async_show_form(
+            step_id="pick_device",
+            data_schema=vol.Schema({
+                vol.Required("device"): selector({"select": {"options": options}}),
+            }),
+        )
+
+    async def async_step_integration_discovery(self, discovery_info):
+        """A device found by the background scanner."""
+        await self.async_set_unique_id(discovery_info["serial"])
+        # Configured devices only get their address refreshed
+        self._abort_if_unique_id_configured(updates={"host": discovery_info["ip"]})
+        self.discovered_device = discovery_info
+        self.context["title_placeholders"] = {
+            "name": discovery_info["name"],
+            "ip": discovery_info["ip"],
+        }
+        return await self.async_step_confirm()
 
     async def async_step_confirm(self, user_input=None):
         """Confirming the addition of a newly discovered device."""
@@ -109,8 +172,13 @@ class H806SBFlowHandler(config_entries.ConfigFlow):
         """Manual entry of device parameters."""
         errors = {}
         if user_input is not None:
+            try:
+                serial = normalize_serial(user_input["serial_number"])
+            except ValueError:
+                errors["serial_number"] = "invalid_serial"
+        if user_input is not None and not errors:
             # Check unique device
-            await self.async_set_unique_id(user_input["serial_number"])
+            await self.async_set_unique_id(serial)
             self._abort_if_unique_id_configured()
             
             # Create entry
@@ -135,25 +203,69 @@ class H806SBFlowHandler(config_entries.ConfigFlow):
 
 
     async def async_discover_devices(self):
-        """Discover devices."""
-        discovery = H806SBDiscovery()
+        """Discover all devices answering within the discovery window."""
+        devices = []
         try:
-            device = await discovery.discover_device()
-            if device:
-                ip, serial, name = device
-                _LOGGER.debug(f"Device found: {name} (IP: {ip})")
-                return {"ip": ip, "serial": serial.hex(), "name": name}
-            _LOGGER.warning("No device found during discovery")
+            for ip, serial, name in await async_scan(self.hass):
+                devices.append({"ip": ip, "serial": normalize_serial(serial.hex()), "name": name})
+            if not devices:
+                _LOGGER.warning("No device found during discovery")
         except Exception as e:
             _LOGGER.error(f"Discovery error:{e}", exc_info=True)
-        finally:
-            if discovery:
-                discovery.close()
-        return None
+        return devices
 
 class H806SBOptionsFlowHandler(config_entries.OptionsFlow):
-    """Option flow for OpenRGB component."""
+    """Option flow for H806SB component."""
     
     async def async_step_init(self, user_input=None):
         """Manage the options."""
-        return await self.async_step_user()
\ No newline at end of file
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        # Setup moves saved options into data, so current values live there
+        config = {**self.config_entry.data, **self.config_entry.options}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_PROBE_INTERVAL,
+                    default=config.get(CONF_PROBE_INTERVAL, DEFAULT_PROBE_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_FAST_PROBE_INTERVAL,
+                    default=config.get(CONF_FAST_PROBE_INTERVAL, DEFAULT_FAST_PROBE_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_MAX_PROBE_INTERVAL,
+                    default=config.get(CONF_MAX_PROBE_INTERVAL, DEFAULT_MAX_PROBE_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_MIN_COMMAND_INTERVAL,
+                    default=config.get(CONF_MIN_COMMAND_INTERVAL, DEFAULT_MIN_COMMAND_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=2)),
+                vol.Required(
+                    CONF_CONFIRM_COMMANDS,
+                    default=config.get(CONF_CONFIRM_COMMANDS, True),
+                ): bool,
+                vol.Required(
+                    CONF_RECONCILE_STATE,
+                    default=config.get(CONF_RECONCILE_STATE, False),
+                ): bool,
+                vol.Required(
+                    CONF_QUEUE_OFFLINE,
+                    default=config.get(CONF_QUEUE_OFFLINE, False),
+                ): bool,
+                vol.Required(
+                    CONF_AIRTIME_RATE,
+                    default=config.get(CONF_AIRTIME_RATE, DEFAULT_AIRTIME_RATE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10000)),
+                vol.Required(
+                    CONF_CAPTURE_PACKETS,
+                    default=config.get(CONF_CAPTURE_PACKETS, False),
+                ): bool,
+                vol.Required(
+                    CONF_TRACE_COMMANDS,
+                    default=config.get(CONF_TRACE_COMMANDS, False),
+                ): bool,
+            }),
+        )
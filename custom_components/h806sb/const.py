@@ -5,7 +5,42 @@ from datetime import timedelta
 DOMAIN = "h806sb"
 CONFIG_VERSION = 1
 
-TRACK_INTERVAL = timedelta(seconds=60)
+# Probe schedules are checked every SWEEP_INTERVAL
+SWEEP_INTERVAL = timedelta(seconds=5)
+# Background discovery of new devices on all local subnets
+DISCOVERY_INTERVAL = timedelta(minutes=15)
+
+# hass.data key of the UDP endpoint shared by all controllers
+DATA_TRANSPORT = f"{DOMAIN}_transport"
+# hass.data key of the availability sweep over all entries
+DATA_FLEET = f"{DOMAIN}_fleet"
+# hass.data key of the persistent device cache
+DATA_CACHE = f"{DOMAIN}_cache"
+# hass.data key of the callback stopping background discovery
+DATA_SCANNER = f"{DOMAIN}_scanner"
+
+# services
+SERVICE_SET_MANY = "set_many"
+SERVICE_APPLY_SCENE = "apply_scene"
+ATTR_STATE = "state"
+ATTR_SPEED = "speed"
+ATTR_REACHABLE = "reachable"
+ATTR_ENTITIES = "entities"
+ATTR_DELAY = "delay"
+# Time to stage a scene's packets before they are released, seconds
+DEFAULT_SCENE_DELAY = 0.05
+
+# options
+CONF_MIN_COMMAND_INTERVAL = "min_command_interval"
+CONF_CONFIRM_COMMANDS = "confirm_commands"
+CONF_PROBE_INTERVAL = "probe_interval"
+CONF_FAST_PROBE_INTERVAL = "fast_probe_interval"
+CONF_MAX_PROBE_INTERVAL = "max_probe_interval"
+CONF_RECONCILE_STATE = "reconcile_state"
+CONF_QUEUE_OFFLINE = "queue_offline"
+CONF_CAPTURE_PACKETS = "capture_packets"
+CONF_AIRTIME_RATE = "airtime_rate"
+CONF_TRACE_COMMANDS = "trace_commands"
 
 # config flow
 CONF_ACTION = "discovery"
@@ -0,0 +1,224 @@
+"""Coordinators for the H806SB Led Controller integration."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .const import DATA_FLEET, SWEEP_INTERVAL
+from .pyh806sb.controller import LedController, async_check_availability_many
+from .pyh806sb.discovery import H806SBDiscovery
+from .pyh806sb.schedule import ProbeSchedule, spread_phase
+from .scanner import async_get_broadcast_addresses
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between two searches for a device that stopped answering,
+# doubled after every search that did not find it
+RELOCATE_COOLDOWN = 30
+MAX_RELOCATE_COOLDOWN = 900
+
+
+class H806SBCoordinator(DataUpdateCoordinator):
+    """Coordinator holding the status of one device.
+
+    It has no update interval of its own: availability is pushed by the
+    controller as soon as a datagram arrives or a probe goes unanswered.
+    A device that stops answering is searched for by serial, in case it
+    got a new address from DHCP.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller: LedController,
+        schedule: ProbeSchedule | None = None,
+        entry: ConfigEntry | None = None,
+    ):
+        """Initialize."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="H806SB Device Status",
+            update_interval=None
+        )
+        self.controller = controller
+        self.schedule = schedule or ProbeSchedule()
+        self._entry = entry
+        self._relocating = False
+        self._last_relocate = float("-inf")
+        self._relocate_cooldown = RELOCATE_COOLDOWN
+        # While a sweep runs, availability changes are held and pushed once
+        self._batching = False
+        self._batched: dict[str, Any] | None = None
+        self._unsub_availability = controller.add_availability_listener(
+            self._handle_availability
+        )
+
+    @callback
+    def _handle_availability(self, available: bool) -> None:
+        """Push availability to the entities when it changes."""
+        if available:
+            self.schedule.seen()
+            self._relocate_cooldown = RELOCATE_COOLDOWN
+        else:
+            self._async_schedule_relocate()
+        current = self._batched or self.data
+        if current is not None and current.get("available") != available:
+            _LOGGER.debug("%s is now %s", self.controller._host, "available" if available else "unavailable")
+            # Just flapped: keep a close eye on it for a while
+            self.schedule.hurry()
+            if self._batching:
+                self._batched = {"available": available}
+            else:
+                self.async_set_updated_data({"available": available})
+
+    @callback
+    def async_begin_batch(self) -> None:
+        self._batching = True
+
+    @callback
+    def async_end_batch(self) -> None:
+        """Push the final availability of the sweep, if it differs from the last pushed."""
+        self._batching = False
+        batched, self._batched = self._batched, None
+        if batched is not None and batched != self.data:
+            self.async_set_updated_data(batched)
+
+    @callback
+    def _async_schedule_relocate(self) -> None:
+        if (
+            self._relocating
+            or self.controller._serial is None
+            or time.monotonic() - self._last_relocate < self._relocate_cooldown
+        ):
+            return
+        self._relocating = True
+        self.hass.async_create_task(self._async_relocate())
+
+    async def _async_relocate(self) -> None:
+        """Look for the device by serial and follow it to its new address."""
+        try:
+            discovery = H806SBDiscovery(
+                self.controller._transport,
+                broadcast_addresses=await async_get_broadcast_addresses(self.hass),
+            )
+            device = await discovery.async_locate(self.controller._serial)
+        finally:
+            self._relocating = False
+            self._last_relocate = time.monotonic()
+        if device is None:
+            # Most likely switched off: search less and less often
+            self._relocate_cooldown = min(MAX_RELOCATE_COOLDOWN, self._relocate_cooldown * 2)
+            return
+        if not self.controller.set_host(device.ip):
+            return
+        if self._entry is not None:
+            self.hass.config_entries.async_update_entry(
+                self._entry, data={**self._entry.data, "host": device.ip}
+            )
+        # The answer pushes availability through the new host listener
+        await self.controller.async_check_availability()
+
+    @callback
+    def async_note_command(self) -> None:
+        """A command was sent: poll the device faster for a while."""
+        self.schedule.hurry()
+
+    async def async_shutdown(self) -> None:
+        """Stop listening to the controller."""
+        await super().async_shutdown()
+        self._unsub_availability()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Checking device availability."""
+        try:
+            available = await self.controller.async_check_availability()
+            _LOGGER.debug(f"available:{available}")
+            return {"available": available}
+        except Exception as err:
+            _LOGGER.error("Error checking device availability: %s", err)
+            raise UpdateFailed(f"Error checking device: {err}")
+
+
+class H806SBFleet:
+    """Availability sweep over devices whose probe schedule is due.
+
+    Every SWEEP_INTERVAL the due devices are probed in one batch. Schedules
+    are spread over the probe interval, so each sweep only carries a small
+    share of the fleet.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._coordinators: dict[str, H806SBCoordinator] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._schedules_created = 0
+        # Devices probed by a sweep that has not finished yet
+        self._in_flight: set[H806SBCoordinator] = set()
+
+    def create_schedule(self, **kwargs: Any) -> ProbeSchedule:
+        """Probe schedule phased after all previously created ones."""
+        phase = spread_phase(self._schedules_created)
+        self._schedules_created += 1
+        return ProbeSchedule(phase=phase, **kwargs)
+
+    def add(self, entry_id: str, coordinator: H806SBCoordinator) -> None:
+        self._coordinators[entry_id] = coordinator
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self._hass, self._async_sweep, SWEEP_INTERVAL
+            )
+
+    def remove(self, entry_id: str) -> None:
+        self._coordinators.pop(entry_id, None)
+        if not self._coordinators and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_sweep(self, now: datetime | None = None) -> None:
+        """Probe due devices back to back; results are pushed by the controllers."""
+        now = time.monotonic()
+        # A device busy with a user command is probed by that command's
+        # confirmation; it stays due and is picked up by a later sweep.
+        # A slow sweep may outlast SWEEP_INTERVAL: its devices are left to it.
+        due = [
+            coordinator
+            for coordinator in self._coordinators.values()
+            if coordinator.schedule.is_due(now)
+            and not coordinator.controller.priority.busy
+            and coordinator not in self._in_flight
+        ]
+        if not due:
+            return
+        self._in_flight.update(due)
+        for coordinator in due:
+            coordinator.async_begin_batch()
+        try:
+            results = await async_check_availability_many(
+                [coordinator.controller for coordinator in due]
+            )
+        finally:
+            self._in_flight.difference_update(due)
+            for coordinator in due:
+                coordinator.async_end_batch()
+        for coordinator, available in zip(due, results):
+            coordinator.schedule.probed(available)
+        _LOGGER.debug("Availability sweep: %s of %s devices answered", sum(results), len(results))
+
+
+def async_get_fleet(hass: HomeAssistant) -> H806SBFleet:
+    """Return the fleet sweeper shared by all entries."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = H806SBFleet(hass)
+    return fleet
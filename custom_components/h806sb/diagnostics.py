@@ -0,0 +1,61 @@
+"""Diagnostics support for the H806SB Led Controller integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .cache import async_get_device_cache
+from .const import DOMAIN
+from .pyh806sb.codec import normalize_serial
+from .pyh806sb.transport import LISTEN_PORT
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    controller = data["controller"]
+    coordinator = data["coordinator"]
+    cache = await async_get_device_cache(hass)
+    serial = entry.data.get("serial_number")
+    return {
+        "entry": dict(entry.data),
+        "cached": cache.get(normalize_serial(serial)) if serial else None,
+        "available": (coordinator.data or {}).get("available"),
+        "silent_for": None if controller.last_seen is None else controller.silent_for(),
+        "rtt": {
+            "srtt": controller.rtt.srtt,
+            "rttvar": controller.rtt.rttvar,
+            "rto": controller.rtt.rto,
+        },
+        "probe_schedule": {
+            "interval": coordinator.schedule.interval,
+            "fast_interval": coordinator.schedule.fast_interval,
+            "max_interval": coordinator.schedule.max_interval,
+        },
+        "metrics": controller.metrics.as_dict(),
+        "suppressed_writes": light.suppressed_writes if (light := data.get("light")) else None,
+        "traces": controller.tracer.as_dict() if controller.tracer else None,
+        "airtime": _airtime(controller),
+        "capture": _capture(controller),
+    }
+
+
+def _airtime(controller) -> dict[str, Any] | None:
+    """Shared pacing state, with the subnet bucket of this device."""
+    limiter = controller._transport.limiter
+    if limiter is None:
+        return None
+    return {"subnet": limiter.subnet(controller.host), **limiter.as_dict()}
+
+
+def _capture(controller) -> dict[str, Any] | None:
+    """Frames exchanged with this device, if packet capture is enabled."""
+    transport = controller._transport
+    if transport.capture is None:
+        return None
+    return transport.capture.export(transport.local_port or LISTEN_PORT, controller.host)
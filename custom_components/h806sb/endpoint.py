@@ -0,0 +1,21 @@
+"""UDP endpoint shared by everything the integration sends and receives."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_TRANSPORT
+from .pyh806sb.transport import H806SBTransport
+
+
+async def async_get_transport(hass: HomeAssistant) -> H806SBTransport:
+    """Return the UDP endpoint shared by all controllers, opening it once.
+
+    Devices always answer to port 4882, so a second socket bound there
+    would steal replies from this one: scans use it too.
+    """
+    transport = hass.data.get(DATA_TRANSPORT)
+    if transport is None:
+        transport = hass.data[DATA_TRANSPORT] = H806SBTransport()
+    await transport.async_start()
+    return transport
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from homeassistant.components.light import (
     LightEntity,
+    LightEntityFeature,
     ColorMode,
     ATTR_BRIGHTNESS,
     ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
 )
+from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -13,15 +16,24 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.util.ulid import ulid_to_bytes
 
-from .controller import LedController
-from .const import DOMAIN, TRACK_INTERVAL
+from .pyh806sb.controller import LedController
+from .const import ATTR_REACHABLE, ATTR_SPEED, CONF_QUEUE_OFFLINE, CONF_RECONCILE_STATE, DOMAIN
+from .pyh806sb.transition import PERCEPTUAL_CURVE, plan_transition
+from .pyh806sb.tracing import Trace
 import logging
-from datetime import timedelta
+import time
+from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
+# A context created longer than this before it reached the entity belongs
+# to a script or automation run, not to the service call itself (seconds)
+DISPATCH_WINDOW = 0.5
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -29,45 +41,27 @@ async def async_setup_entry(
 ) -> None:
     """Setting up the light platform."""
     config = entry.data
-    
-    # Create a controller and set the serial number
-    controller = LedController(host=config["host"])
-    if "serial_number" in config:
-        controller.set_serial_number(config["serial_number"])
-    
-    # Create a coordinator to check the device status
-    coordinator = H806SBCoordinator(hass, controller)
-    await coordinator.async_config_entry_first_refresh()
-    
-    async_add_entities([H806SBLight(coordinator, controller, config)])
+    data = hass.data[DOMAIN][entry.entry_id]
+    controller = data["controller"]
+    coordinator = data["coordinator"]
 
-class H806SBCoordinator(DataUpdateCoordinator):
-    """Coordinator for checking the device status."""
-    
-    def __init__(self, hass: HomeAssistant, controller: LedController):
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="H806SB Device Status",
-            update_interval=TRACK_INTERVAL
-        )
-        self.controller = controller
-    
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Checking device availability."""
-        try:
-            available = await self.controller.async_check_availability()
-            _LOGGER.debug(f"available:{available}")
-            return {"available": available}
-        except Exception as err:
-            _LOGGER.error("Error checking device status: %s", err)
-            raise UpdateFailed(f"Error communicating with device: {err}")
+    light = H806SBLight(coordinator, controller, config)
+    # Group services address lights through their entry
+    data["light"] = light
+    async_add_entities([light])
 
-class H806SBLight(CoordinatorEntity, LightEntity):
+
+def to_device_brightness(brightness: int) -> int:
+    """Convert Home Assistant brightness (0-255) to device brightness (0-31)."""
+    return PERCEPTUAL_CURVE[max(0, min(255, int(brightness)))]
+
+
+class H806SBLight(CoordinatorEntity, LightEntity, RestoreEntity):
     """Implementation of H806SB light control."""
     
     _attr_color_mode = ColorMode.RGB
     _attr_supported_color_modes = {ColorMode.RGB}
+    _attr_supported_features = LightEntityFeature.TRANSITION
     
     def __init__(
         self,
@@ -80,73 +74,233 @@ class H806SBLight(CoordinatorEntity, LightEntity):
         self._controller = controller
         self._config = config
         self._attr_name = config.get("name", "H806SB Light")
-        self._attr_unique_id = f"h806sb_{config['host']}"
+        # The host may change with a new DHCP lease, the serial does not
+        serial = config.get("serial_number")
+        self._attr_unique_id = f"h806sb_{serial.lower() if serial else config['host']}"
         self._attr_is_on = False
         self._attr_brightness = 255
         self._attr_rgb_color = (255, 255, 255)
         self._default_speed = 20
+        self._queue_offline = config.get(CONF_QUEUE_OFFLINE, False)
+        self._last_written: tuple | None = None
+        # Writes skipped because nothing visible changed (for diagnostics)
+        self.suppressed_writes = 0
+
+    @property
+    def available(self) -> bool:
+        """Reachable device, not just a successful coordinator update.
+
+        With queue_offline the light stays available so that services
+        reach it while the device is away; see the reachable attribute.
+        """
+        return super().available and (self._attr_available or self._queue_offline)
+
+    @property
+    def reachable(self) -> bool:
+        """The device answers right now."""
+        return self._attr_available
+
+    @property
+    def speed(self) -> int:
+        """Playback speed used for commands."""
+        return self._default_speed
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {ATTR_SPEED: self._default_speed, ATTR_REACHABLE: self._attr_available}
 
     async def async_added_to_hass(self) -> None:
         """When adding to home assistant"""
         await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        # unavailable/unknown say nothing about what the device should show
+        if last_state is not None and last_state.state in (STATE_ON, STATE_OFF):
+            attributes = last_state.attributes
+            self._attr_is_on = last_state.state == STATE_ON
+            if attributes.get(ATTR_BRIGHTNESS) is not None:
+                self._attr_brightness = attributes[ATTR_BRIGHTNESS]
+            if attributes.get(ATTR_RGB_COLOR) is not None:
+                self._attr_rgb_color = tuple(attributes[ATTR_RGB_COLOR])
+            if attributes.get(ATTR_SPEED) is not None:
+                self._default_speed = attributes[ATTR_SPEED]
+            if self._config.get(CONF_RECONCILE_STATE, False):
+                # Sent once the device is actually heard from: cached
+                # availability is only a guess. Any command supersedes it.
+                self._controller.queue_state(*self._device_state(self._attr_is_on, self._attr_brightness))
         self._handle_coordinator_update()
 
+    def _device_state(self, is_on: bool, brightness: int) -> tuple[int, int, bool]:
+        """Device brightness, speed and mode flag for an entity state."""
+        if is_on:
+            return to_device_brightness(brightness), self._default_speed, True
+        return 0, 20, True
+
+    @callback
+    def _async_queue(self, is_on: bool, brightness: int) -> None:
+        """Keep the state for the offline device and show it as desired."""
+        self._controller.queue_state(*self._device_state(is_on, brightness))
+        self._attr_is_on = is_on
+        self._attr_brightness = brightness
+        self._async_write_if_changed()
+
+    def _service_call_time(self) -> float | None:
+        """Monotonic time the service call being handled was made, or None."""
+        if self._context is None or self._context_set is None:
+            return None
+        now = time.monotonic()
+        # Home Assistant sets the context right before calling the entity method
+        since_set = self.hass.loop.time() - self._context_set
+        if since_set > DISPATCH_WINDOW:
+            return None
+        called = now - since_set
+        try:
+            # The context id is a ULID: its first 48 bits are the creation time in ms
+            created = int.from_bytes(ulid_to_bytes(self._context.id)[:6], "big") / 1000
+        except ValueError:
+            return called
+        age = time.time() - created
+        if since_set <= age <= since_set + DISPATCH_WINDOW:
+            called = now - age
+        return called
+
+    def _start_trace(self, name: str) -> Trace | None:
+        """Trace of a command from the service call on, dispatch included."""
+        called = self._service_call_time()
+        trace = self._controller.start_trace(name, called)
+        if trace and called is not None:
+            trace.mark("dispatch")
+        return trace
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write the state only if it differs from the last one written."""
+        snapshot = (
+            self._attr_available,
+            self._attr_is_on,
+            self._attr_brightness,
+            self._attr_rgb_color,
+            self._default_speed,
+        )
+        if snapshot == self._last_written:
+            self.suppressed_writes += 1
+            return
+        self._last_written = snapshot
+        self.async_write_ha_state()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handling data from coordinator."""
-        self._attr_available = self.coordinator.data.get("available", False)
-        self.async_write_ha_state()
+        available = self.coordinator.data.get("available", False)
+        if available and not self._attr_available:
+            # The device may have lost its state while unreachable
+            self._controller.invalidate_state()
+        self._attr_available = available
+        self._async_write_if_changed()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on light with parameters."""
+        trace = self._start_trace("turn_on")
+        brightness = kwargs.get(ATTR_BRIGHTNESS, self._attr_brightness)
         if not self._attr_available:
+            if self._queue_offline:
+                self._async_queue(True, brightness)
+                return
             raise HomeAssistantError("Device is not available")
+        if trace:
+            trace.mark("available")
         
-        brightness = kwargs.get(ATTR_BRIGHTNESS, self._attr_brightness)
-        device_brightness = int((brightness / 255) * 31)
+        device_brightness = to_device_brightness(brightness)
         
         if ATTR_RGB_COLOR in kwargs:
             self._attr_rgb_color = kwargs[ATTR_RGB_COLOR]
             #TODO RGB Handling
         try:
-            success = await self._controller.async_send_packet(
-                brightness=device_brightness,
-                speed=self._default_speed,
-                is_on=True
-            )
+            if transition := kwargs.get(ATTR_TRANSITION):
+                self._async_start_transition(brightness, transition)
+                success = True
+            else:
+                success = await self._controller.async_set_state(
+                    brightness=device_brightness,
+                    speed=self._default_speed,
+                    is_on=True,
+                    trace=trace,
+                )
             if not success:
-                raise HomeAssistantError("Failed to send command to device")
+                if self._queue_offline:
+                    # Lost while sending: apply it when the device is back
+                    self._async_queue(True, brightness)
+                    return
+                raise HomeAssistantError("Device did not answer after the command")
+            # The device answered right after the frame; it does not report
+            # whether it applied it, so the requested state is shown
+            self.coordinator.async_note_command()
                 
             self._attr_is_on = True
             self._attr_brightness = brightness
-            self.async_write_ha_state()
+            self._async_write_if_changed()
+            if trace:
+                trace.mark("state")
             
         except Exception as err:
             _LOGGER.error(f"Error turning on light:{err}")
             raise HomeAssistantError(f"Error turning on light: {err}")
+        finally:
+            if trace:
+                trace.finish(trace.last_stage == "state")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn Off Light."""
+        trace = self._start_trace("turn_off")
         if not self._attr_available:
+            if self._queue_offline:
+                self._async_queue(False, self._attr_brightness)
+                return
             raise HomeAssistantError("Device is not available")
+        if trace:
+            trace.mark("available")
             
         try:
-            success = await self._controller.async_send_packet(
-                brightness=0,
-                speed=20,
-                is_on=True
-            )
+            if transition := kwargs.get(ATTR_TRANSITION):
+                self._async_start_transition(0, transition)
+                success = True
+            else:
+                success = await self._controller.async_set_state(
+                    brightness=0,
+                    speed=20,
+                    is_on=True,
+                    trace=trace,
+                )
             if not success:
-                raise HomeAssistantError("Failed to send command to device")
+                if self._queue_offline:
+                    self._async_queue(False, self._attr_brightness)
+                    return
+                raise HomeAssistantError("Device did not answer after the command")
+            self.coordinator.async_note_command()
                 
             self._attr_is_on = False
-            self.async_write_ha_state()
+            self._async_write_if_changed()
+            if trace:
+                trace.mark("state")
             
         except Exception as err:
             _LOGGER.error("Error turning off light: %s", err)
             raise HomeAssistantError(f"Error turning off light: {err}")
+        finally:
+            if trace:
+                trace.finish(trace.last_stage == "state")
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Clearing during integration deletion."""
-        await super().async_will_remove_from_hass()
-        await self._controller.async_close()
\ No newline at end of file
+    @callback
+    def _async_start_transition(self, brightness: int, duration: float) -> None:
+        """Ramp from the current to the target brightness on the device."""
+        start = self._attr_brightness if self._attr_is_on else 0
+        steps = plan_transition(start, brightness, duration, self._controller.frame_interval)
+        speed = self._default_speed if brightness else 20
+        self._controller.start_transition(steps, speed, True)
+
+    @callback
+    def async_apply_group_state(self, is_on: bool, brightness: int | None = None) -> None:
+        """Update the state after a group command was sent to the device."""
+        self._attr_is_on = is_on
+        if brightness is not None:
+            self._attr_brightness = brightness
+        self._async_write_if_changed()
@@ -0,0 +1,27 @@
+"""Async client for H806SB LED controllers, independent of Home Assistant.
+
+The integration uses it through relative imports; outside Home Assistant
+put this directory's parent on the path and import or run it directly:
+
+    PYTHONPATH=custom_components/h806sb python -m pyh806sb scan
+"""
+
+from .airtime import AirtimeLimiter
+from .client import DEFAULT_PARALLEL, H806SBClient
+from .controller import LedController, async_check_availability_many, async_send_many
+from .discovery import DiscoveredDevice, H806SBDiscovery
+from .transport import DEVICE_PORT, LISTEN_PORT, H806SBTransport
+
+__all__ = [
+    "AirtimeLimiter",
+    "DEFAULT_PARALLEL",
+    "DEVICE_PORT",
+    "LISTEN_PORT",
+    "DiscoveredDevice",
+    "H806SBClient",
+    "H806SBDiscovery",
+    "H806SBTransport",
+    "LedController",
+    "async_check_availability_many",
+    "async_send_many",
+]
@@ -0,0 +1,160 @@
+"""Command line client for bulk work on H806SB controllers.
+
+    python -m pyh806sb scan [--broadcast 192.168.1.255 ...]
+    python -m pyh806sb probe 192.168.1.20 192.168.1.21 ...
+    python -m pyh806sb set --brightness 31 --all
+    python -m pyh806sb set --off --file site.txt
+
+Targets are HOST or HOST=SERIAL, on the command line or one per line in
+--file; --all adds every device found by a scan. Serials missing from
+set targets are filled in from a scan. At most --parallel devices are in
+flight at once; --rate paces them to that many packets per second and
+subnet.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from typing import Optional
+
+from .client import DEFAULT_PARALLEL, H806SBClient
+from .controller import LedController
+from .transport import LISTEN_PORT
+
+
+def _parse_targets(args) -> dict[str, Optional[str]]:
+    """host -> serial (None if unknown), in input order."""
+    lines = list(args.targets)
+    if args.file:
+        with open(args.file, encoding="utf-8") as file:
+            lines += [line.split("#")[0].strip() for line in file]
+    targets: dict[str, Optional[str]] = {}
+    for line in filter(None, lines):
+        host, _, serial = line.partition("=")
+        targets[host.strip()] = serial.strip() or None
+    return targets
+
+
+async def _async_controllers(client: H806SBClient, args, need_serials: bool) -> list[LedController]:
+    targets = _parse_targets(args)
+    if args.all or (need_serials and None in targets.values()):
+        for device in await client.async_scan(args.timeout, args.broadcast):
+            if args.all or device.ip in targets:
+                if targets.get(device.ip) is None:
+                    targets[device.ip] = device.serial.hex()
+    missing = [host for host, serial in targets.items() if need_serials and serial is None]
+    for host in missing:
+        print(f"{host}: serial unknown, skipped (did not answer the scan)", file=sys.stderr)
+        del targets[host]
+    return [client.controller(host, serial) for host, serial in targets.items()]
+
+
+def _report(args, rows: list[dict], elapsed: float):
+    if args.json:
+        print(json.dumps({"elapsed": round(elapsed, 3), "devices": rows}, indent=2))
+        return
+    for row in rows:
+        print("  ".join(str(value) for value in row.values()))
+    print(f"{len(rows)} devices in {elapsed:.2f}s", file=sys.stderr)
+
+
+async def _async_scan(client: H806SBClient, args):
+    start = time.monotonic()
+    devices = await client.async_scan(args.timeout, args.broadcast)
+    rows = [{"ip": d.ip, "serial": d.serial.hex(), "name": d.name} for d in devices]
+    _report(args, rows, time.monotonic() - start)
+    return 0 if rows else 1
+
+
+async def _async_probe(client: H806SBClient, args):
+    controllers = await _async_controllers(client, args, need_serials=False)
+    start = time.monotonic()
+    results = await client.async_probe_many(controllers, args.parallel)
+    rows = [
+        {
+            "ip": controller.host,
+            "available": available,
+            "rtt_ms": None if controller.rtt.last_rtt is None else round(controller.rtt.last_rtt * 1000, 1),
+        }
+        for controller, available in zip(controllers, results)
+    ]
+    _report(args, rows, time.monotonic() - start)
+    return 0 if all(results) else 1
+
+
+async def _async_set(client: H806SBClient, args):
+    controllers = await _async_controllers(client, args, need_serials=True)
+    start = time.monotonic()
+    results = await client.async_set_many(
+        controllers,
+        brightness=0 if args.off else args.brightness,
+        speed=args.speed,
+        is_on=True,
+        parallel=args.parallel,
+    )
+    rows = [
+        {"ip": controller.host, "serial": controller._serial, "success": success}
+        for controller, success in zip(controllers, results)
+    ]
+    _report(args, rows, time.monotonic() - start)
+    return 0 if all(results) else 1
+
+
+async def _async_main(args) -> int:
+    async with H806SBClient(
+        args.port, confirm_commands=not args.no_confirm, airtime_rate=args.rate
+    ) as client:
+        return await args.handler(client, args)
+
+
+def main(argv=None) -> int:
+    # Accepted before or after the command name. Defaults come from the
+    # namespace, so a command does not reset a value given before it.
+    common = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    common.add_argument("--port", type=int, help=f"local UDP port (default {LISTEN_PORT})")
+    common.add_argument("--timeout", type=float, help="scan window, seconds (default 2)")
+    common.add_argument("--broadcast", action="append", help="broadcast address (repeatable)")
+    common.add_argument("--parallel", type=int, help=f"devices in flight (default {DEFAULT_PARALLEL})")
+    common.add_argument("--rate", type=float, help="packets per second and subnet")
+    common.add_argument("--json", action="store_true", help="machine readable output")
+    common.add_argument("--debug", action="store_true")
+
+    parser = argparse.ArgumentParser(
+        prog="pyh806sb", description=__doc__.splitlines()[0], parents=[common]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", parents=[common], help="list devices answering a broadcast")
+    scan.set_defaults(handler=_async_scan)
+
+    for name, handler, help_text in (
+        ("probe", _async_probe, "check that devices answer"),
+        ("set", _async_set, "send one state to many devices"),
+    ):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument("targets", nargs="*", metavar="HOST[=SERIAL]")
+        command.add_argument("--file", help="targets, one per line")
+        command.add_argument("--all", action="store_true", help="every device found by a scan")
+        command.set_defaults(handler=handler)
+        if name == "set":
+            level = command.add_mutually_exclusive_group(required=True)
+            level.add_argument("--brightness", type=int, choices=range(32), metavar="0-31")
+            level.add_argument("--off", action="store_true")
+            command.add_argument("--speed", type=int, default=20)
+            command.add_argument("--no-confirm", action="store_true", help="fire and forget")
+
+    defaults = argparse.Namespace(
+        port=LISTEN_PORT, timeout=2, broadcast=None, parallel=DEFAULT_PARALLEL,
+        rate=None, json=False, debug=False,
+    )
+    args = parser.parse_args(argv, namespace=defaults)
+    args.no_confirm = getattr(args, "no_confirm", False)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    return asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
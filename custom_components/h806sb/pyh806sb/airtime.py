@@ -0,0 +1,191 @@
+import asyncio
+import time
+from collections import deque
+from ipaddress import ip_network
+from typing import Optional
+
+from .priority import PRIORITY_BACKGROUND, PRIORITY_USER
+
+DEFAULT_AIRTIME_RATE = 100.0   # packets per second and subnet
+# Bucket depth in seconds of the rate: short bursts go out unpaced
+BURST_SECONDS = 0.2
+DEFAULT_PREFIX = 24
+
+
+class _Bucket:
+    __slots__ = (
+        "rate", "capacity", "tokens", "updated", "queues", "timer",
+        "recent", "sent", "deferred", "deferred_time",
+    )
+
+    def __init__(self, rate: float, capacity: float):
+        # Packets per second; 0 leaves the subnet unpaced
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        # One FIFO of waiting futures per priority, user first
+        self.queues: tuple[deque, deque] = (deque(), deque())
+        self.timer: Optional[asyncio.TimerHandle] = None
+        # Send times of the last second, for the current rate
+        self.recent: deque = deque()
+        self.sent = 0
+        self.deferred = 0
+        self.deferred_time = 0.0
+
+
+class AirtimeLimiter:
+    """Token buckets pacing the datagrams sent to each subnet.
+
+    Devices behind the same access points share a subnet, so one bucket
+    per subnet (prefix bits) approximates one bucket per AP. Packets are
+    never dropped: a sender without a token waits in its priority queue
+    and user commands are released before any waiting probe. Bursts that
+    must stay time-aligned are charged without waiting, which may drive
+    the bucket negative; later traffic pays the debt back.
+
+    Each subnet is paced at the lowest rate set for its hosts (hosts set
+    to 0 do not count, a subnet of only such hosts is not paced) and at
+    the default rate if none of its hosts has one.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_AIRTIME_RATE,
+        burst: Optional[float] = None,
+        prefix: int = DEFAULT_PREFIX,
+    ):
+        self.rate = rate
+        self._burst = burst
+        self.capacity = self._capacity(rate)
+        self._prefix = prefix
+        self._buckets: dict[str, _Bucket] = {}
+        self._keys: dict[str, str] = {}
+        self._rates: dict[str, float] = {}
+
+    def _capacity(self, rate: float) -> float:
+        return self._burst or max(1.0, rate * BURST_SECONDS)
+
+    def set_rates(self, rates: dict[str, float]):
+        """Rate per host, replacing the previous ones; buckets follow at once."""
+        self._rates = dict(rates)
+        now = time.monotonic()
+        for key, bucket in self._buckets.items():
+            self._refill(bucket, now)
+            bucket.rate = self._subnet_rate(key)
+            bucket.capacity = self._capacity(bucket.rate)
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+            if any(bucket.queues):
+                if bucket.timer is not None:
+                    bucket.timer.cancel()
+                    bucket.timer = None
+                self._schedule(bucket)
+
+    def _subnet_rate(self, key: str) -> float:
+        rates = [rate for host, rate in self._rates.items() if self.subnet(host) == key]
+        if not rates:
+            return self.rate
+        return min((rate for rate in rates if rate > 0), default=0.0)
+
+    def subnet(self, host: str) -> str:
+        """Key of the bucket that paces host."""
+        key = self._keys.get(host)
+        if key is None:
+            try:
+                key = str(ip_network(f"{host}/{self._prefix}", strict=False))
+            except ValueError:
+                key = host
+            key = self._keys[host] = key
+        return key
+
+    def _bucket(self, host: str) -> _Bucket:
+        key = self.subnet(host)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = self._subnet_rate(key)
+            bucket = self._buckets[key] = _Bucket(rate, self._capacity(rate))
+        return bucket
+
+    def _refill(self, bucket: _Bucket, now: float):
+        bucket.tokens = min(bucket.capacity, bucket.tokens + (now - bucket.updated) * bucket.rate)
+        bucket.updated = now
+
+    @staticmethod
+    def _record(bucket: _Bucket, now: float):
+        bucket.sent += 1
+        bucket.recent.append(now)
+        while bucket.recent and bucket.recent[0] < now - 1:
+            bucket.recent.popleft()
+
+    async def async_acquire(self, host: str, priority: int = PRIORITY_BACKGROUND):
+        """Wait for a token of host's subnet."""
+        bucket = self._bucket(host)
+        now = time.monotonic()
+        self._refill(bucket, now)
+        # Nobody of equal or higher priority may be overtaken
+        queued = any(bucket.queues[p] for p in range(priority + 1))
+        if bucket.rate <= 0 and not queued:
+            self._record(bucket, now)
+            return
+        if not queued and bucket.tokens >= 1:
+            bucket.tokens -= 1
+            self._record(bucket, now)
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        bucket.queues[priority].append(fut)
+        bucket.deferred += 1
+        self._schedule(bucket)
+        try:
+            await fut
+        finally:
+            bucket.deferred_time += time.monotonic() - now
+
+    def charge(self, host: str, count: int = 1):
+        """Account for packets sent without waiting."""
+        bucket = self._bucket(host)
+        now = time.monotonic()
+        self._refill(bucket, now)
+        if bucket.rate > 0:
+            bucket.tokens -= count
+        for _ in range(count):
+            self._record(bucket, now)
+
+    def _schedule(self, bucket: _Bucket):
+        if bucket.timer is None:
+            delay = max(0.0, (1 - bucket.tokens) / bucket.rate) if bucket.rate > 0 else 0.0
+            bucket.timer = asyncio.get_running_loop().call_later(delay, self._release, bucket)
+
+    def _release(self, bucket: _Bucket):
+        bucket.timer = None
+        now = time.monotonic()
+        self._refill(bucket, now)
+        for queue in bucket.queues:
+            while queue and (bucket.tokens >= 1 or bucket.rate <= 0):
+                fut = queue.popleft()
+                if fut.done():
+                    continue
+                if bucket.rate > 0:
+                    bucket.tokens -= 1
+                self._record(bucket, now)
+                fut.set_result(None)
+        if any(bucket.queues):
+            self._schedule(bucket)
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        stats = {}
+        for key, bucket in self._buckets.items():
+            self._refill(bucket, now)
+            stats[key] = {
+                "limit_pps": bucket.rate,
+                "rate_pps": sum(1 for sent in bucket.recent if sent >= now - 1),
+                "tokens": round(bucket.tokens, 2),
+                "queued_user": len(bucket.queues[PRIORITY_USER]),
+                "queued_background": len(bucket.queues[PRIORITY_BACKGROUND]),
+                "sent": bucket.sent,
+                "deferred": bucket.deferred,
+                "mean_deferral_ms": round(bucket.deferred_time / bucket.deferred * 1000, 3)
+                if bucket.deferred else None,
+            }
+        return {"rate": self.rate, "burst": self.capacity, "buckets": stats}
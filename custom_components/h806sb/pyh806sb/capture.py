@@ -0,0 +1,123 @@
+"""Bounded in-memory capture of the raw datagrams of the shared endpoint.
+
+Recording appends a tuple to a deque; nothing is formatted until the
+capture is exported, as JSONL (one frame per line) or as pcap with
+synthetic IPv4/UDP headers so it opens in Wireshark.
+"""
+
+import base64
+import json
+import socket
+import struct
+import time
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+DEFAULT_CAPTURE_SIZE = 2048
+
+DIRECTION_IN = "in"
+DIRECTION_OUT = "out"
+
+# pcap global header: magic, version 2.4, tz, sigfigs, snaplen, LINKTYPE_RAW
+_PCAP_HEADER = struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 101)
+_PCAP_RECORD = struct.Struct("<IIII")
+_IPV4_HEADER = struct.Struct("!BBHHHBBH4s4s")
+_UDP_HEADER = struct.Struct("!HHHH")
+
+
+class CapturedFrame(NamedTuple):
+    timestamp: float          # time.monotonic() when sent or received
+    direction: str            # DIRECTION_IN or DIRECTION_OUT
+    addr: Tuple[str, int]     # remote address
+    data: bytes
+
+
+def _ipv4_checksum(header: bytes) -> int:
+    total = sum(struct.unpack(f"!{len(header) // 2}H", header))
+    total = (total & 0xFFFF) + (total >> 16)
+    total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _packed_ip(host: str) -> bytes:
+    try:
+        return socket.inet_aton(host)
+    except OSError:
+        return bytes(4)
+
+
+class PacketCapture:
+    """Ring buffer of the last maxlen frames with their direction and timestamp."""
+
+    def __init__(self, maxlen: int = DEFAULT_CAPTURE_SIZE):
+        self._frames: deque = deque(maxlen=maxlen)
+        # Converts monotonic timestamps to wall clock for pcap
+        self._wall_offset = time.time() - time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def record(self, direction: str, addr: Tuple[str, int], data: bytes):
+        # bytes() because senders reuse their buffers
+        self._frames.append(CapturedFrame(time.monotonic(), direction, addr, bytes(data)))
+
+    def clear(self):
+        self._frames.clear()
+
+    def frames(self, host: Optional[str] = None) -> list[CapturedFrame]:
+        """Captured frames, oldest first, optionally only those of one host."""
+        if host is None:
+            return list(self._frames)
+        return [frame for frame in self._frames if frame.addr[0] == host]
+
+    def to_jsonl(self, host: Optional[str] = None) -> str:
+        return "\n".join(
+            json.dumps({
+                "t": round(frame.timestamp, 6),
+                "dir": frame.direction,
+                "host": frame.addr[0],
+                "port": frame.addr[1],
+                "data": frame.data.hex(),
+            })
+            for frame in self.frames(host)
+        )
+
+    def to_pcap(self, local_port: int, host: Optional[str] = None) -> bytes:
+        """pcap (LINKTYPE_RAW) of the frames; the local address is written as 0.0.0.0."""
+        chunks = [_PCAP_HEADER]
+        local_ip = bytes(4)
+        for index, frame in enumerate(self.frames(host)):
+            remote_ip = _packed_ip(frame.addr[0])
+            if frame.direction == DIRECTION_OUT:
+                src, dst = (local_ip, local_port), (remote_ip, frame.addr[1])
+            else:
+                src, dst = (remote_ip, frame.addr[1]), (local_ip, local_port)
+            udp = _UDP_HEADER.pack(src[1], dst[1], _UDP_HEADER.size + len(frame.data), 0)
+            length = _IPV4_HEADER.size + len(udp) + len(frame.data)
+            ip = _IPV4_HEADER.pack(
+                0x45, 0, length, index & 0xFFFF, 0, 64, socket.IPPROTO_UDP, 0, src[0], dst[0]
+            )
+            ip = ip[:10] + struct.pack("!H", _ipv4_checksum(ip)) + ip[12:]
+            seconds, fraction = divmod(frame.timestamp + self._wall_offset, 1)
+            chunks.append(_PCAP_RECORD.pack(int(seconds), int(fraction * 1e6), length, length))
+            chunks.extend((ip, udp, frame.data))
+        return b"".join(chunks)
+
+    def export(self, local_port: int, host: Optional[str] = None) -> dict:
+        """Both export formats, ready to be embedded in a JSON document."""
+        return {
+            "frames": len(self.frames(host)),
+            "jsonl": self.to_jsonl(host),
+            "pcap_base64": base64.b64encode(self.to_pcap(local_port, host)).decode("ascii"),
+        }
+
+
+def load_jsonl(lines: Iterable[str]) -> Iterator[CapturedFrame]:
+    """Frames of a JSONL export."""
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        yield CapturedFrame(
+            record["t"], record["dir"], (record["host"], record["port"]), bytes.fromhex(record["data"])
+        )
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from .airtime import AirtimeLimiter
+from .controller import LedController, async_check_availability_many
+from .discovery import DiscoveredDevice, H806SBDiscovery
+from .transport import LISTEN_PORT, H806SBTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PARALLEL = 64
+
+
+class H806SBClient:
+    """One UDP endpoint and a pool of controllers on it, for use without Home Assistant.
+
+    Controllers are created once per host and all share the endpoint, so
+    hundreds of devices cost one socket. Bulk operations keep at most
+    `parallel` devices in flight at a time. With `airtime_rate` every
+    datagram is paced to that many packets per second and subnet.
+
+        async with H806SBClient() as client:
+            devices = await client.async_scan()
+            controllers = [client.controller(d.ip, d.serial.hex()) for d in devices]
+            await client.async_set_many(controllers, brightness=31)
+    """
+
+    def __init__(
+        self,
+        port: int = LISTEN_PORT,
+        confirm_commands: bool = True,
+        min_command_interval: float = 0.0,
+        airtime_rate: Optional[float] = None,
+    ):
+        self._transport = H806SBTransport(port)
+        if airtime_rate:
+            self._transport.limiter = AirtimeLimiter(airtime_rate)
+        self._confirm_commands = confirm_commands
+        self._min_command_interval = min_command_interval
+        self._controllers: dict[str, LedController] = {}
+
+    @property
+    def transport(self) -> H806SBTransport:
+        return self._transport
+
+    async def __aenter__(self) -> "H806SBClient":
+        await self._transport.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.async_close()
+
+    def controller(self, host: str, serial: Optional[str] = None) -> LedController:
+        """The pooled controller of host, created on first use."""
+        controller = self._controllers.get(host)
+        if controller is None:
+            controller = self._controllers[host] = LedController(
+                host,
+                self._transport,
+                min_command_interval=self._min_command_interval,
+                confirm_commands=self._confirm_commands,
+            )
+        if serial and controller._serial != serial.lower():
+            controller.set_serial_number(serial)
+        return controller
+
+    async def async_scan(
+        self, timeout: float = 2, broadcast_addresses: Optional[Iterable[str]] = None
+    ) -> list[DiscoveredDevice]:
+        discovery = H806SBDiscovery(self._transport, broadcast_addresses=broadcast_addresses)
+        return await discovery.discover_devices(timeout)
+
+    async def async_probe_many(
+        self, controllers: list[LedController], parallel: int = DEFAULT_PARALLEL
+    ) -> list[bool]:
+        """Availability of every controller, probed in batches of `parallel`."""
+        results: list[bool] = []
+        for start in range(0, len(controllers), parallel):
+            results += await async_check_availability_many(controllers[start:start + parallel])
+        return results
+
+    async def async_set_many(
+        self,
+        controllers: list[LedController],
+        brightness: int,
+        speed: int = 20,
+        is_on: bool = True,
+        parallel: int = DEFAULT_PARALLEL,
+    ) -> list[bool]:
+        """Send one state to every controller with at most `parallel` commands in flight."""
+        semaphore = asyncio.Semaphore(parallel)
+
+        async def _async_set(controller: LedController) -> bool:
+            async with semaphore:
+                try:
+                    return await controller.async_set_state(brightness, speed, is_on)
+                except Exception as e:
+                    _LOGGER.warning("Command to %s failed: %s", controller.host, e)
+                    return False
+
+        return list(await asyncio.gather(*(_async_set(controller) for controller in controllers)))
+
+    async def async_close(self):
+        for controller in self._controllers.values():
+            await controller.async_close()
+        self._controllers.clear()
+        self._transport.close()
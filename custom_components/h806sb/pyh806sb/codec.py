@@ -0,0 +1,131 @@
+"""Frame layouts of the H806SB UDP protocol.
+
+Control frame (0xFB 0xC1), 16 bytes:
+    header(2) counter(1) speed(1) brightness(1) mode(1) unknown(2)
+    constants(4) serial(4, little-endian)
+
+Probe frame (0xAB 0x01), 12 bytes:
+    header(2) 0x00 0x02 reserved(4) serial(4)
+
+Reply frame (0xAB 0x02):
+    header(2) name, NUL terminated, e.g. "H806SB_0c3951"
+"""
+
+import struct
+from typing import NamedTuple, Optional
+
+CONTROL_HEADER = bytes([0xFB, 0xC1])
+PROBE_HEADER = bytes([0xAB, 0x01])
+REPLY_HEADER = bytes([0xAB, 0x02])
+
+CONTROL_FRAME = struct.Struct("<2sBBBB2s4s4s")
+PROBE_FRAME = struct.Struct("<2sBB4s4s")
+
+# Offsets of the fields patched on every command
+_COUNTER_SPEED_BRIGHTNESS_MODE = struct.Struct("<BBBB")
+_COUNTER_OFFSET = 2
+
+# Bytes 6-7 are always 0x00 0xAE in captured traffic
+_CONTROL_UNKNOWN = bytes([0x00, 0xAE])
+_NO_SERIAL = bytes(4)
+
+# Discovery broadcast is the bare header, the per-device probe is the full frame
+DISCOVERY_PACKET = PROBE_HEADER
+PROBE_PACKET = PROBE_FRAME.pack(PROBE_HEADER, 0x00, 0x02, bytes(4), _NO_SERIAL)
+
+
+class Reply(NamedTuple):
+    name: str
+    serial: Optional[str]
+
+
+class Control(NamedTuple):
+    counter: int
+    speed: int
+    brightness: int
+    is_on: bool
+    serial: bytes
+
+
+def encode_serial(serial_number: str) -> bytes:
+    """Hex serial to the 4 wire bytes.
+
+    Example:
+        "0c3951" (3 bytes) -> filling to 4 bytes - "00 0c 39 51" -> revers to "51 39 0c 00"
+    """
+    serial_as_bytes = bytes.fromhex(serial_number)
+    if len(serial_as_bytes) > 4:
+        raise ValueError(f"Serial number too long: {serial_number}")
+    return bytes(reversed(serial_as_bytes.rjust(4, b"\x00")))
+
+
+def normalize_serial(serial_number: str) -> str:
+    """Canonical form of a hex serial: 8 lowercase digits ("0C3951" -> "000c3951")."""
+    return encode_serial(serial_number)[::-1].hex()
+
+
+class ControlFrame:
+    """Reusable control frame buffer of one controller."""
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, serial: bytes = _NO_SERIAL):
+        self._buffer = bytearray(CONTROL_FRAME.size)
+        CONTROL_FRAME.pack_into(
+            self._buffer, 0,
+            CONTROL_HEADER,
+            0x00,        # Counter (will be increased)
+            0x20,        # Speed
+            0x00,        # Brightness
+            0x01,        # Single file playback
+            _CONTROL_UNKNOWN,
+            _NO_SERIAL,  # Constants as serial number
+            serial,
+        )
+
+    def set_serial(self, serial: bytes):
+        self._buffer[12:16] = serial
+
+    def pack(self, counter: int, speed: int, brightness: int, is_on: bool) -> bytearray:
+        """Patch the variable fields in place and return the buffer.
+
+        The buffer is reused by the next call; senders must not keep it.
+        """
+        _COUNTER_SPEED_BRIGHTNESS_MODE.pack_into(
+            self._buffer, _COUNTER_OFFSET,
+            counter % 256,
+            max(1, min(100, speed)),       # speed 1-100
+            max(0, min(31, brightness)),   # brightness 0-31
+            1 if is_on else 0,
+        )
+        return self._buffer
+
+
+def is_reply(data: bytes) -> bool:
+    return len(data) >= 2 and data[0] == 0xAB and data[1] == 0x02
+
+
+def parse_reply(data: bytes) -> Optional[Reply]:
+    """Parse a 0xAB 0x02 reply without copying the payload."""
+    if not is_reply(data):
+        return None
+    end = data.find(b"\x00", 2)
+    if end < 0:
+        end = len(data)
+    name = str(memoryview(data)[2:end], "ascii", "ignore")
+    _, sep, serial = name.partition("_")
+    if not sep or not serial:
+        return Reply(name, None)
+    try:
+        bytes.fromhex(serial)
+    except ValueError:
+        return Reply(name, None)
+    return Reply(name, serial.lower())
+
+
+def parse_control(data: bytes) -> Optional[Control]:
+    """Fields of a 0xFB 0xC1 control frame (for captures and emulators)."""
+    if len(data) != CONTROL_FRAME.size or data[:2] != CONTROL_HEADER:
+        return None
+    _, counter, speed, brightness, mode, _, _, serial = CONTROL_FRAME.unpack(data)
+    return Control(counter, speed, brightness, bool(mode), serial)
@@ -0,0 +1,520 @@
+import asyncio
+import logging
+import time
+from ipaddress import ip_address
+from typing import Callable, Optional, Sequence, Tuple
+
+from .codec import PROBE_PACKET, ControlFrame, encode_serial, is_reply
+from .metrics import ControllerMetrics
+from .pipeline import DEFAULT_MIN_COMMAND_INTERVAL, CommandPipeline
+from .priority import PRIORITY_USER, PriorityGate
+from .rtt import DEFAULT_ATTEMPTS, RttEstimator
+from .tracing import Trace, TraceBuffer, mark
+from .transition import MIN_FRAME_INTERVAL, Step, TransitionEngine
+from .transport import DEVICE_PORT, H806SBTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_check_availability_many(
+    controllers: list["LedController"],
+    timeout: Optional[float] = None,
+    attempts: int = 2,
+) -> list[bool]:
+    """Probe all controllers back to back and wait for replies in one timeout window.
+
+    The window is the largest retransmission timeout among the probed
+    controllers unless timeout is given. Controllers that stay silent are
+    probed again, up to attempts rounds.
+    """
+    results = [False] * len(controllers)
+    if not controllers:
+        return results
+    transport = controllers[0]._transport
+    tokens = [controller.priority.begin_background() for controller in controllers]
+    pending = list(range(len(controllers)))
+    for attempt in range(attempts):
+        window = timeout or max(controllers[i].rtt.rto for i in pending)
+        try:
+            if not transport.is_running:
+                await controllers[0].async_initialize()
+            for i in pending:
+                controllers[i].metrics.probes_sent += 1
+            replies = await transport.async_request_many(
+                [controllers[i]._probe_request() for i in pending], window
+            )
+        except OSError as e:
+            _LOGGER.warning(f"Socket error during availability sweep: {e}")
+            return results
+        silent = []
+        for i, reply in zip(pending, replies):
+            controller = controllers[i]
+            if LedController._is_alive_reply(reply):
+                results[i] = True
+                controller.metrics.record_rtt(reply.rtt)
+                if attempt == 0:
+                    controller.rtt.sample(reply.rtt)
+            else:
+                controller.metrics.probe_timeouts += 1
+                controller.rtt.backoff()
+                silent.append(i)
+        pending = silent
+        if not pending:
+            break
+    for i in pending:
+        if controllers[i].priority.preempted(tokens[i]):
+            # A user command ran meanwhile and has the newer verdict
+            controllers[i].metrics.probes_preempted += 1
+        else:
+            controllers[i]._set_lost()
+    return results
+
+async def async_send_many(
+    commands: list[Tuple["LedController", int, int, bool]],
+    at: Optional[float] = None,
+) -> list[Optional[float]]:
+    """Send control packets to many controllers in one tight burst.
+
+    Each controller may appear only once. With `at` (a time on the event
+    loop's monotonic clock) the commands are staged and released by a
+    single loop callback scheduled for that moment, which sends them all
+    without yielding to other work. Staging stops running transitions and
+    drops queued states of the controllers; the packets are packed at
+    release, so a command sent meanwhile does not leave a staged packet
+    with a counter the device has already seen. Returns, per command, the
+    send time in seconds relative to `at` (or to the first packet), or
+    None if that send failed.
+    """
+    if not commands:
+        return []
+    transport = commands[0][0]._transport
+    if not transport.is_running:
+        await commands[0][0].async_initialize()
+
+    states = [
+        (controller, (brightness, speed, is_on))
+        for controller, brightness, speed, is_on in commands
+    ]
+    for controller, _ in states:
+        controller._transition.cancel()
+        controller._desired = None
+    loop = asyncio.get_running_loop()
+
+    def burst(start: float) -> list[Optional[float]]:
+        results: list[Optional[float]] = []
+        for controller, state in states:
+            packet = controller._build_packet(*state)
+            try:
+                transport.sendto(packet, (controller._host, controller._port))
+            except OSError as err:
+                _LOGGER.error("Error sending UDP packet to %s: %s", controller._host, err)
+                controller.metrics.send_errors += 1
+                results.append(None)
+                continue
+            results.append(loop.time() - start)
+            # Alignment beats pacing: the burst is only billed to the limiter
+            transport.charge(controller._host)
+            controller.priority.touch()
+            controller._transition.cancel()
+            controller._desired = None
+            controller.metrics.packets_sent += 1
+            controller._command_counter += 1
+            controller._pipeline.mark_sent(*state)
+        return results
+
+    if at is None:
+        return burst(loop.time())
+
+    released = loop.create_future()
+
+    def release():
+        if not released.done():
+            released.set_result(burst(at))
+
+    handle = loop.call_at(at, release)
+    try:
+        return await released
+    finally:
+        handle.cancel()
+
+class LedController:
+    """LED control device by using UDP for Home Assistant."""
+    
+    def __init__(
+        self,
+        host: str,
+        transport: H806SBTransport,
+        port: int = DEVICE_PORT,
+        min_command_interval: float = DEFAULT_MIN_COMMAND_INTERVAL,
+        confirm_commands: bool = True,
+    ):
+        self._host = host
+        self._port = port
+        self._transport = transport
+        self._pipeline = CommandPipeline(self, min_command_interval)
+        self._transition = TransitionEngine()
+        self._confirm_commands = confirm_commands
+        self.priority = PriorityGate()
+        self.rtt = RttEstimator()
+        self.metrics = ControllerMetrics()
+        # Opt-in per-stage timing of commands
+        self.tracer: Optional[TraceBuffer] = None
+        # Any datagram from the device proves it is alive
+        self.last_seen: Optional[float] = None
+        self._availability_listeners: list[Callable[[bool], None]] = []
+        self._remove_host_listener = transport.add_host_listener(host, self._on_datagram)
+        # State to send as soon as an offline device is heard from again
+        self._desired: Optional[Tuple[int, int, bool]] = None
+        self._desired_task: Optional[asyncio.Task] = None
+        self._command_counter = 0
+        self._serial: Optional[str] = None
+        self._serial_number = bytes(4)
+        # Serial number will be filled after discovery
+        self._frame = ControlFrame()
+
+    @staticmethod
+    def compare_ips(ip1: str, ip2: str) -> bool:
+        try:
+            return ip_address(ip1) == ip_address(ip2)
+        except ValueError:
+            return ip1 == ip2
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    def set_host(self, host: str) -> bool:
+        """Follow the device to a new address; returns False if it did not change."""
+        if self.compare_ips(host, self._host):
+            return False
+        _LOGGER.info("Device %s moved from %s to %s", self._serial, self._host, host)
+        self._remove_host_listener()
+        self._host = host
+        self._remove_host_listener = self._transport.add_host_listener(host, self._on_datagram)
+        # A new lease usually means the device rebooted
+        self.invalidate_state()
+        return True
+
+    def add_availability_listener(self, listener: Callable[[bool], None]) -> Callable[[], None]:
+        """Subscribe to availability changes detected by the controller.
+
+        listener(True) is called for every datagram from the device and
+        listener(False) when a probe or a confirmed command gets no answer.
+        """
+        self._availability_listeners.append(listener)
+
+        def remove():
+            if listener in self._availability_listeners:
+                self._availability_listeners.remove(listener)
+
+        return remove
+
+    def silent_for(self) -> float:
+        """Seconds since the last datagram from the device."""
+        if self.last_seen is None:
+            return float("inf")
+        return time.monotonic() - self.last_seen
+
+    def _on_datagram(self, data: bytes, addr):
+        self.last_seen = time.monotonic()
+        if self._desired is not None and self._desired_task is None:
+            self._desired_task = asyncio.get_running_loop().create_task(self._async_send_desired())
+        for listener in self._availability_listeners:
+            listener(True)
+
+    def _set_lost(self):
+        for listener in self._availability_listeners:
+            listener(False)
+
+    async def async_initialize(self):
+        """Make sure the shared UDP endpoint is open (during start process)."""
+        try:
+            if not self._transport.is_running:
+                self.metrics.socket_reinits += 1
+            await self._transport.async_start()
+        except Exception as e:
+            _LOGGER.error(f"Socket initialization failed: {e}")
+            raise
+
+    async def async_send_packet(
+        self, brightness: int, speed: int, is_on: bool, traces: Sequence[Trace] = ()
+    ):
+        """Send control packet to device."""
+        if not self._transport.is_running:
+            await self.async_initialize()
+        mark(traces, "initialize")
+        await self._transport.async_pace(self._host, PRIORITY_USER)
+        mark(traces, "pace")
+        packet = self._build_packet(brightness, speed, is_on)
+        
+        try:
+            try:
+                self._transport.sendto(packet, (self._host, self._port))
+            except OSError:
+                # Endpoint lost meanwhile: reopening is serialized by the transport
+                await self.async_initialize()
+                mark(traces, "initialize")
+                self._transport.sendto(packet, (self._host, self._port))
+            mark(traces, "send")
+            self._command_counter += 1
+            self.metrics.packets_sent += 1
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Sent to %s:%s - %s", self._host, self._port, packet.hex())
+            return True
+        except Exception as err:
+            _LOGGER.error("Error sending UDP packet: %s", err)
+            self.metrics.send_errors += 1
+            return False
+
+    async def async_send_confirmed(
+        self,
+        brightness: int,
+        speed: int,
+        is_on: bool,
+        attempts: int = DEFAULT_ATTEMPTS,
+        traces: Sequence[Trace] = (),
+    ) -> bool:
+        """Send control packet and check that the device is still reachable.
+
+        Every attempt sends the control packet followed by a probe and waits
+        a retransmission timeout for the reply to that probe; unanswered
+        attempts are resent with the same counter byte. The device does not
+        acknowledge control frames, so a reply only proves it was reachable
+        right after the frame, not that the frame arrived: once answered,
+        the frame is sent one more time (same counter, so the device applies
+        it at most once) to make a lost frame unlikely.
+        """
+        if not self._transport.is_running:
+            await self.async_initialize()
+        mark(traces, "initialize")
+        packet = bytes(self._build_packet(brightness, speed, is_on))
+        self._command_counter += 1
+
+        for attempt in range(attempts):
+            rto = self.rtt.rto
+            # Control packet and probe
+            await self._transport.async_pace(self._host, PRIORITY_USER, 2)
+            mark(traces, "pace")
+            waiter = self._transport.register_waiter(self._host, self._serial)
+            try:
+                sent = time.monotonic()
+                self._transport.sendto(packet, (self._host, self._port))
+                self._transport.sendto(PROBE_PACKET, (self._host, DEVICE_PORT))
+                mark(traces, "send")
+                self.metrics.packets_sent += 1
+                self.metrics.probes_sent += 1
+                await asyncio.wait_for(waiter, rto)
+            except asyncio.TimeoutError:
+                _LOGGER.debug("No confirmation from %s within %.3fs (attempt %s)", self._host, rto, attempt + 1)
+                self.metrics.probe_timeouts += 1
+                self.rtt.backoff()
+                continue
+            except OSError as err:
+                _LOGGER.warning("Error sending UDP packet: %s", err)
+                self.metrics.send_errors += 1
+                if attempt + 1 == attempts:
+                    return False
+                # Reopen the endpoint (serialized by the transport) and retry
+                try:
+                    await self.async_initialize()
+                except OSError:
+                    return False
+                mark(traces, "initialize")
+                continue
+            finally:
+                self._transport.unregister_waiter(waiter, self._host, self._serial)
+
+            rtt = time.monotonic() - sent
+            mark(traces, "confirm")
+            self.metrics.record_rtt(rtt)
+            # Karn: retransmitted attempts are ambiguous, only sample the first
+            if attempt == 0:
+                self.rtt.sample(rtt)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Reachable %s:%s after %s", self._host, self._port, packet.hex())
+            await self._async_resend(packet)
+            return True
+
+        _LOGGER.warning("Device %s did not confirm command after %s attempts", self._host, attempts)
+        self._set_lost()
+        return False
+
+    async def _async_resend(self, packet: bytes):
+        """Send an answered control packet once more (best effort)."""
+        await self._transport.async_pace(self._host, PRIORITY_USER)
+        try:
+            self._transport.sendto(packet, (self._host, self._port))
+        except OSError as err:
+            _LOGGER.debug("Resend to %s failed: %s", self._host, err)
+            self.metrics.send_errors += 1
+            return
+        self.metrics.packets_sent += 1
+
+    async def async_send_command(
+        self, brightness: int, speed: int, is_on: bool, traces: Sequence[Trace] = ()
+    ) -> bool:
+        """Send a control packet, confirmed by the device when enabled.
+
+        Runs at user priority: background probes of this controller are
+        held back meanwhile and their overlapping failures are ignored.
+        """
+        with self.priority.user():
+            if self._confirm_commands:
+                return await self.async_send_confirmed(brightness, speed, is_on, traces=traces)
+            return await self.async_send_packet(brightness, speed, is_on, traces)
+
+    def _build_packet(self, brightness: int, speed: int, is_on: bool) -> bytearray:
+        """Control packet for the next counter value (counter is not advanced).
+
+        Returns the controller's reusable frame buffer.
+        """
+        return self._frame.pack(self._command_counter + 1, speed, brightness, is_on)
+
+    async def async_set_state(
+        self, brightness: int, speed: int, is_on: bool, trace: Optional[Trace] = None
+    ) -> bool:
+        """Send a control packet through the latest-wins command pipeline.
+
+        Commands arriving faster than the minimum packet gap are merged, and a
+        command matching the last sent state is not sent again.
+        """
+        self._transition.cancel()
+        self._desired = None
+        return await self._pipeline.async_submit(brightness, speed, is_on, trace)
+
+    def start_trace(self, name: str, start: Optional[float] = None) -> Optional[Trace]:
+        """A new trace to mark and finish, or None while tracing is off.
+
+        start backdates the trace to an earlier monotonic time, like the
+        moment the command was requested.
+        """
+        if self.tracer is None:
+            return None
+        return self.tracer.start(name, start)
+
+    @property
+    def desired_state(self) -> Optional[Tuple[int, int, bool]]:
+        return self._desired
+
+    def queue_state(self, brightness: int, speed: int, is_on: bool):
+        """Remember the state for a device that is not answering (latest wins).
+
+        It is sent with a single packet once any datagram arrives from the
+        device, unless a command is sent before that.
+        """
+        self._transition.cancel()
+        self._desired = (brightness, speed, is_on)
+        self.metrics.commands_queued += 1
+
+    async def _async_send_desired(self):
+        try:
+            state, self._desired = self._desired, None
+            # The device may have restarted while it was away
+            self.invalidate_state()
+            if not await self._pipeline.async_submit(*state) and self._desired is None:
+                # Lost again before confirming: keep waiting with the same state
+                self._desired = state
+        finally:
+            self._desired_task = None
+
+    @property
+    def frame_interval(self) -> float:
+        """Shortest gap between two steps of a brightness ramp."""
+        return max(MIN_FRAME_INTERVAL, self._pipeline.min_interval)
+
+    def start_transition(self, steps: list[Step], speed: int, is_on: bool = True):
+        """Play a brightness ramp in the background; any later command cancels it."""
+        self._transition.start(
+            steps, lambda level: self._pipeline.async_submit(level, speed, is_on)
+        )
+
+    def invalidate_state(self):
+        """Force the next async_set_state to be sent even if unchanged."""
+        self._pipeline.reset()
+
+    async def async_check_availability(
+        self, timeout: Optional[float] = None, attempts: int = DEFAULT_ATTEMPTS
+    ) -> bool:
+        """Check availability of led controller.
+
+        Without an explicit timeout each attempt waits for the current
+        retransmission timeout derived from the measured round-trip time.
+        """
+        token = self.priority.begin_background()
+        try:
+            if not self._transport.is_running:
+                await self.async_initialize()
+            
+            check_packet, addr, serial = self._probe_request()
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(f"Sending alive check: {check_packet.hex()} to {self._host}:{DEVICE_PORT}")
+
+            for attempt in range(attempts):
+                # The reply is routed back to us by the shared transport (by IP or serial)
+                try:
+                    self.metrics.probes_sent += 1
+                    reply = await self._transport.async_request(
+                        check_packet, addr, timeout or self.rtt.rto, serial=serial
+                    )
+                except OSError as e:
+                    _LOGGER.warning(f"Socket error: {e}")
+                    self.metrics.send_errors += 1
+                    return False
+
+                if self._is_alive_reply(reply):
+                    self.metrics.record_rtt(reply.rtt)
+                    if attempt == 0:
+                        self.rtt.sample(reply.rtt)
+                    return True
+                self.metrics.probe_timeouts += 1
+                self.rtt.backoff()
+
+            _LOGGER.debug("No response received within timeout")
+            if self.priority.preempted(token):
+                self.metrics.probes_preempted += 1
+            else:
+                self._set_lost()
+            return False
+
+        except Exception as e:
+            _LOGGER.error(f"Availability check failed: {e}", exc_info=True)
+            return False
+
+    def _probe_request(self):
+        """Probe datagram, destination and routing serial for the shared transport."""
+        return PROBE_PACKET, (self._host, DEVICE_PORT), self._serial
+
+    @staticmethod
+    def _is_alive_reply(reply) -> bool:
+        return reply is not None and is_reply(reply[0])
+
+    async def async_close(self):
+        """Cleaning of resources (pending commands are dropped).
+
+        The UDP endpoint is shared by all controllers and is closed by the
+        integration when the last entry is unloaded.
+        """
+        self._remove_host_listener()
+        self._availability_listeners.clear()
+        self._transition.cancel()
+        self._desired = None
+        if self._desired_task is not None:
+            self._desired_task.cancel()
+        await self._pipeline.async_close()
+
+    def set_serial_number(self, serial_number: str):
+        """Setting the serial number with zero filling and reverse..
+        
+        Example:
+            "0с3951" (3 bytes) -> filling to 4 bytes - "00 0с 39 51" -> revers to "51 39 0с 00"
+        """
+        try:
+            self._serial_number = encode_serial(serial_number)
+            self._frame.set_serial(self._serial_number)
+            self._serial = serial_number.lower()
+            
+            _LOGGER.info(f"Serial number set: {self._serial_number.hex()}")
+            
+        except ValueError as ve:
+            _LOGGER.error(f"Invalid serial number format: {ve}")
+            raise
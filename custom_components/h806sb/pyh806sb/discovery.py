@@ -0,0 +1,125 @@
+import asyncio
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+import logging
+
+from .codec import DISCOVERY_PACKET, REPLY_HEADER, normalize_serial, parse_reply
+from .transport import DEVICE_PORT, LISTEN_PORT, H806SBTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DiscoveredDevice(NamedTuple):
+    ip: str
+    serial: bytes
+    name: str
+
+
+class H806SBDiscovery:
+    DEVICE_PORT = DEVICE_PORT
+    LISTEN_PORT = LISTEN_PORT
+    DISCOVERY_PACKET = DISCOVERY_PACKET
+    RESPONSE_HEADER = REPLY_HEADER
+    BROADCAST_ADDRESS = "255.255.255.255"
+
+    def __init__(
+        self,
+        transport: Optional[H806SBTransport] = None,
+        broadcast_address: str = BROADCAST_ADDRESS,
+        broadcast_addresses: Optional[Iterable[str]] = None,
+    ):
+        """Use the integration's shared endpoint if given, otherwise a private one.
+
+        broadcast_addresses (e.g. the directed broadcast of every local
+        subnet) replaces the single broadcast_address when given.
+        """
+        self._own_transport = transport is None
+        self._transport = transport or H806SBTransport(self.LISTEN_PORT)
+        self._broadcast_addresses = list(broadcast_addresses or [broadcast_address])
+
+    @staticmethod
+    def parse_response(data: bytes, ip: str) -> Optional[DiscoveredDevice]:
+        """Extract (ip, serial, name) from a 0xAB 0x02 reply."""
+        reply = parse_reply(data)
+        if reply is None:
+            return None
+        if reply.serial is None:
+            _LOGGER.warning(f"Invalid serial format: {reply.name}")
+            return None
+        return DiscoveredDevice(ip, bytes.fromhex(reply.serial), reply.name)
+
+    async def async_discover(self, timeout: float = 2) -> AsyncIterator[DiscoveredDevice]:
+        """Yield every unique device as its reply arrives, until the deadline."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        replies: asyncio.Queue = asyncio.Queue()
+        seen: set[bytes] = set()
+
+        await self._transport.async_start()
+        remove_listener = self._transport.add_listener(
+            lambda data, addr: replies.put_nowait((data, addr))
+        )
+        try:
+            # Отправка широковещательного запроса
+            for address in self._broadcast_addresses:
+                try:
+                    self._transport.sendto(self.DISCOVERY_PACKET, (address, self.DEVICE_PORT))
+                except OSError as e:
+                    # One unreachable subnet must not stop the others
+                    if len(self._broadcast_addresses) == 1:
+                        raise
+                    _LOGGER.debug(f"Discovery to {address} failed: {e}")
+            _LOGGER.debug(f"Discovery packets sent to {self._broadcast_addresses} from port {self._transport.local_port}")
+
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    data, addr = await asyncio.wait_for(replies.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                device = self.parse_response(data, addr[0])
+                if device is None or device.serial in seen:
+                    continue
+                seen.add(device.serial)
+                _LOGGER.debug(f"Device found: {device.name} (IP: {device.ip})")
+                yield device
+        finally:
+            remove_listener()
+
+    async def discover_devices(self, timeout: float = 2) -> list[DiscoveredDevice]:
+        """Collect all devices answering within timeout."""
+        try:
+            return [device async for device in self.async_discover(timeout)]
+        except OSError as e:
+            _LOGGER.error(f"Discovery failed: {e}", exc_info=True)
+            return []
+
+    async def discover_device(self, timeout: float = 2) -> Optional[DiscoveredDevice]:
+        """Finding a compatible device on the network."""
+        devices = self.async_discover(timeout)
+        try:
+            async for device in devices:
+                return device
+        except OSError as e:
+            _LOGGER.error(f"Discovery failed: {e}", exc_info=True)
+        finally:
+            await devices.aclose()
+        return None
+
+    async def async_locate(self, serial: str, timeout: float = 2) -> Optional[DiscoveredDevice]:
+        """Find the device with the given serial, returning as soon as it answers."""
+        wanted = bytes.fromhex(normalize_serial(serial))
+        devices = self.async_discover(timeout)
+        try:
+            async for device in devices:
+                # Foreign replies may carry longer serials: they just don't match
+                if device.serial.rjust(len(wanted), b"\x00") == wanted:
+                    return device
+        except OSError as e:
+            _LOGGER.error(f"Discovery failed: {e}", exc_info=True)
+        finally:
+            await devices.aclose()
+        return None
+
+    def close(self):
+        if self._own_transport:
+            _LOGGER.debug("Closing socket for discovery")
+            self._transport.close()
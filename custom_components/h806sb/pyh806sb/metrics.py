@@ -0,0 +1,76 @@
+import math
+from collections import deque
+from typing import Optional
+
+# Recent probe round trips kept for percentiles
+RTT_WINDOW = 512
+
+
+def percentile(sorted_samples: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..1) of already sorted samples."""
+    if not sorted_samples:
+        return None
+    rank = min(len(sorted_samples) - 1, max(0, math.ceil(q * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+class ControllerMetrics:
+    """Counters of one controller.
+
+    Recording is an attribute increment or a deque append; percentiles are
+    only computed when a snapshot is read.
+    """
+
+    __slots__ = (
+        "packets_sent", "send_errors", "probes_sent", "probe_timeouts",
+        "probes_preempted", "socket_reinits", "commands_queued", "queue_depth",
+        "max_queue_depth", "rtt_max", "_rtts",
+    )
+
+    def __init__(self):
+        self.packets_sent = 0
+        self.send_errors = 0
+        self.probes_sent = 0
+        self.probe_timeouts = 0
+        # Failed probes ignored because a user command overlapped them
+        self.probes_preempted = 0
+        self.socket_reinits = 0
+        # Commands held for an offline device
+        self.commands_queued = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.rtt_max: Optional[float] = None
+        self._rtts: deque = deque(maxlen=RTT_WINDOW)
+
+    def record_rtt(self, rtt: float):
+        self._rtts.append(rtt)
+        if self.rtt_max is None or rtt > self.rtt_max:
+            self.rtt_max = rtt
+
+    def set_queue_depth(self, depth: int):
+        self.queue_depth = depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def rtt_percentiles(self) -> dict[str, Optional[float]]:
+        samples = sorted(self._rtts)
+        return {
+            "p50": percentile(samples, 0.5),
+            "p95": percentile(samples, 0.95),
+            "max": self.rtt_max,
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            "packets_sent": self.packets_sent,
+            "send_errors": self.send_errors,
+            "probes_sent": self.probes_sent,
+            "probe_timeouts": self.probe_timeouts,
+            "probes_preempted": self.probes_preempted,
+            "socket_reinits": self.socket_reinits,
+            "commands_queued": self.commands_queued,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "probe_rtt": self.rtt_percentiles(),
+            "probe_rtt_samples": len(self._rtts),
+        }
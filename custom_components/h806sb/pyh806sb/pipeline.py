@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .tracing import Trace, mark
+
+if TYPE_CHECKING:
+    from .controller import LedController
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MIN_COMMAND_INTERVAL = 0.1
+
+CommandState = Tuple[int, int, bool]
+
+
+class CommandPipeline:
+    """Latest-wins queue of control commands for one controller.
+
+    While a packet is being sent or the minimum gap between packets has not
+    elapsed, newer commands replace the pending one, so a slider drag ends up
+    as a few packets carrying the newest state instead of a backlog.
+    """
+
+    def __init__(self, controller: "LedController", min_interval: float = DEFAULT_MIN_COMMAND_INTERVAL):
+        self._controller = controller
+        self.min_interval = min_interval
+        self._pending: Optional[CommandState] = None
+        self._waiters: list[asyncio.Future] = []
+        self._inflight: list[asyncio.Future] = []
+        # Traces of the pending commands, carried by the packet that sends them
+        self._traces: list[Trace] = []
+        self._last_sent: Optional[CommandState] = None
+        self._last_sent_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def last_sent(self) -> Optional[CommandState]:
+        return self._last_sent
+
+    @staticmethod
+    def normalize(brightness: int, speed: int, is_on: bool) -> CommandState:
+        return (max(0, min(31, brightness)), max(1, min(100, speed)), is_on)
+
+    def mark_sent(self, brightness: int, speed: int, is_on: bool):
+        """Record a state that was sent outside the pipeline (e.g. a group burst)."""
+        self._last_sent = self.normalize(brightness, speed, is_on)
+        self._last_sent_at = time.monotonic()
+
+    def reset(self):
+        """Forget the last sent state so the next command always goes out."""
+        self._last_sent = None
+
+    async def async_submit(
+        self, brightness: int, speed: int, is_on: bool, trace: Optional[Trace] = None
+    ) -> bool:
+        """Queue a command; resolves once it (or a newer one) has been sent."""
+        state = self.normalize(brightness, speed, is_on)
+        if self._task is None and state == self._last_sent:
+            _LOGGER.debug("Skipping command identical to last sent state: %s", state)
+            if trace:
+                trace.mark("queue")
+            return True
+
+        self._pending = state
+        if trace:
+            self._traces.append(trace)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._controller.metrics.set_queue_depth(len(self._waiters) + len(self._inflight))
+        if self._task is None:
+            self._task = asyncio.create_task(self._async_run())
+        return await asyncio.shield(waiter)
+
+    async def _async_run(self):
+        try:
+            while self._pending is not None:
+                delay = self._last_sent_at + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                state, self._inflight = self._pending, self._waiters
+                self._pending, self._waiters = None, []
+                traces, self._traces = self._traces, []
+                mark(traces, "queue")
+
+                if state == self._last_sent:
+                    success = True
+                else:
+                    success = await self._controller.async_send_command(*state, traces=traces)
+                    if success:
+                        self._last_sent = state
+                        self._last_sent_at = time.monotonic()
+
+                for waiter in self._inflight:
+                    if not waiter.done():
+                        waiter.set_result(success)
+                self._inflight = []
+                self._controller.metrics.set_queue_depth(len(self._waiters))
+        except Exception as err:
+            for waiter in (*self._inflight, *self._waiters):
+                if not waiter.done():
+                    waiter.set_exception(err)
+            self._inflight, self._waiters, self._traces = [], [], []
+            self._pending = None
+        finally:
+            self._task = None
+            self._controller.metrics.set_queue_depth(len(self._waiters))
+
+    async def async_close(self):
+        """Stop the pipeline, failing commands that were not sent yet."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for waiter in (*self._inflight, *self._waiters):
+            if not waiter.done():
+                waiter.cancel()
+        self._inflight, self._waiters, self._traces = [], [], []
+        self._pending = None
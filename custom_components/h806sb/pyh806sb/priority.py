@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+# Queue order of the airtime limiter, most urgent first
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+
+
+class PriorityGate:
+    """Arbitration between user commands and background probes of one controller.
+
+    User commands never wait for anything: they run alongside a probe
+    that is already in flight. Background work is not started while a
+    command is active, and a background result that overlapped a command
+    is stale (the command's own confirmation is the newer verdict), so it
+    must not mark the device lost.
+    """
+
+    __slots__ = ("_active", "_epoch")
+
+    def __init__(self):
+        self._active = 0
+        # Bumped by every command, so overlap is detected after the fact too
+        self._epoch = 0
+
+    @property
+    def busy(self) -> bool:
+        """A user command is being sent or confirmed right now."""
+        return self._active > 0
+
+    @contextmanager
+    def user(self) -> Iterator[None]:
+        self._active += 1
+        self._epoch += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._epoch += 1
+
+    def touch(self):
+        """A command went out without waiting for anything."""
+        self._epoch += 1
+
+    def begin_background(self) -> int:
+        """Token to pass to preempted() when the background work is done."""
+        return self._epoch
+
+    def preempted(self, token: int) -> bool:
+        return self._active > 0 or self._epoch != token
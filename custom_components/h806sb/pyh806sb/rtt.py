@@ -0,0 +1,45 @@
+from typing import Optional
+
+# Retransmission timeout bounds, seconds
+MIN_RTO = 0.05
+INITIAL_RTO = 1.0
+MAX_RTO = 2.0
+
+DEFAULT_ATTEMPTS = 3
+
+
+class RttEstimator:
+    """Smoothed round-trip time of one controller (RFC 6298).
+
+    Only first attempts are sampled (Karn's algorithm); every timeout
+    doubles the retransmission timeout until the next valid sample.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    __slots__ = ("srtt", "rttvar", "_rto", "last_rtt")
+
+    def __init__(self):
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self.last_rtt: Optional[float] = None
+        self._rto = INITIAL_RTO
+
+    @property
+    def rto(self) -> float:
+        return self._rto
+
+    def sample(self, rtt: float):
+        self.last_rtt = rtt
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self._rto = max(MIN_RTO, min(MAX_RTO, self.srtt + self.K * self.rttvar))
+
+    def backoff(self):
+        self._rto = min(MAX_RTO, self._rto * 2)
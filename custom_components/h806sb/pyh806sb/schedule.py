@@ -0,0 +1,95 @@
+import random
+import time
+
+DEFAULT_PROBE_INTERVAL = 30.0
+DEFAULT_FAST_PROBE_INTERVAL = 10.0
+# Bounds how long a device that dies stays available: no worse than the
+# old fixed 60 s poll
+DEFAULT_MAX_PROBE_INTERVAL = 60.0
+# Failed probes back off up to this, so a strip switched off at the wall
+# costs a probe every few minutes instead of every fast_interval
+DEFAULT_MAX_FAILED_PROBE_INTERVAL = 300.0
+
+# Low-discrepancy phase sequence: any number of schedules ends up evenly
+# spread over the interval without knowing the fleet size in advance.
+_GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+def spread_phase(index: int) -> float:
+    """Phase in [0, 1) of the index-th schedule."""
+    return (index * _GOLDEN_RATIO_CONJUGATE) % 1.0
+
+
+class ProbeSchedule:
+    """When the next availability probe of one device is due.
+
+    Any traffic from the device postpones the probe. The interval drops to
+    fast_interval after a command, a first failed probe or an availability
+    change, and grows by backoff after every successful probe up to
+    max_interval. Further failed probes double it, up to
+    max_failed_interval. Every due time is jittered so devices never
+    align, but never beyond the cap of the current interval.
+    """
+
+    __slots__ = (
+        "interval", "fast_interval", "max_interval", "max_failed_interval",
+        "backoff", "jitter", "failures", "next_due", "_rng",
+    )
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_PROBE_INTERVAL,
+        fast_interval: float = DEFAULT_FAST_PROBE_INTERVAL,
+        max_interval: float = DEFAULT_MAX_PROBE_INTERVAL,
+        phase: float = 0.0,
+        backoff: float = 1.5,
+        jitter: float = 0.1,
+        max_failed_interval: float = DEFAULT_MAX_FAILED_PROBE_INTERVAL,
+    ):
+        self.fast_interval = min(fast_interval, interval)
+        self.max_interval = max(max_interval, interval)
+        self.max_failed_interval = max(max_failed_interval, self.fast_interval)
+        self.interval = interval
+        self.backoff = backoff
+        self.jitter = jitter
+        # Failed probes in a row
+        self.failures = 0
+        self._rng = random.Random()
+        self.next_due = time.monotonic() + phase * interval
+
+    def is_due(self, now: float) -> bool:
+        return now >= self.next_due
+
+    def _reschedule(self):
+        spread = self.interval * self.jitter
+        delay = self.interval + self._rng.uniform(-spread, spread)
+        cap = self.max_failed_interval if self.failures else self.max_interval
+        self.next_due = time.monotonic() + min(delay, max(cap, self.interval))
+
+    def seen(self):
+        """The device sent something: no need to probe for another interval."""
+        if self.failures:
+            # Back from the dead: watch it closely again
+            self.failures = 0
+            self.interval = self.fast_interval
+        self._reschedule()
+
+    def probed(self, success: bool):
+        if success:
+            self.failures = 0
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        else:
+            self.failures += 1
+            self.interval = min(
+                self.max_failed_interval, self.fast_interval * 2 ** (self.failures - 1)
+            )
+        self._reschedule()
+
+    def probe_now(self):
+        """Probe at the next sweep (instead of blocking setup on a probe)."""
+        self.next_due = time.monotonic()
+
+    def hurry(self):
+        """Poll fast again (after a command or an availability change)."""
+        self.interval = self.fast_interval
+        self.next_due = min(self.next_due, time.monotonic() + self.interval)
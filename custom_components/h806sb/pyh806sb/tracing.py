@@ -0,0 +1,110 @@
+import time
+from collections import deque
+from typing import Iterable, Optional
+
+from .metrics import percentile
+
+# Finished traces kept per controller
+TRACE_WINDOW = 256
+
+
+class Trace:
+    """Monotonic timestamps of the stages one command went through.
+
+    Each mark closes the stage that started at the previous mark (or at
+    the start of the trace). A stage reached twice, like a resent packet,
+    adds up.
+    """
+
+    __slots__ = ("name", "start", "marks", "success", "_buffer")
+
+    def __init__(self, name: str, buffer: "TraceBuffer", start: Optional[float] = None):
+        self.name = name
+        self.start = time.monotonic() if start is None else start
+        self.marks: list[tuple[str, float]] = []
+        self.success: Optional[bool] = None
+        self._buffer = buffer
+
+    def mark(self, stage: str):
+        self.marks.append((stage, time.monotonic()))
+
+    def finish(self, success: Optional[bool] = None):
+        self.success = success
+        self._buffer.append(self)
+
+    def stages(self) -> dict[str, float]:
+        """Seconds spent in each stage, in order of first appearance."""
+        stages: dict[str, float] = {}
+        previous = self.start
+        for stage, at in self.marks:
+            stages[stage] = stages.get(stage, 0.0) + at - previous
+            previous = at
+        return stages
+
+    @property
+    def last_stage(self) -> Optional[str]:
+        return self.marks[-1][0] if self.marks else None
+
+    @property
+    def total(self) -> float:
+        return self.marks[-1][1] - self.start if self.marks else 0.0
+
+
+def mark(traces: Iterable[Trace], stage: str):
+    """Mark stage on every trace riding on one packet (usually none)."""
+    for trace in traces:
+        trace.mark(stage)
+
+
+class TraceBuffer:
+    """Bounded record of recent command traces of one controller.
+
+    Tracing is off unless a buffer is attached to the controller; without
+    one no trace objects or timestamps are created.
+    """
+
+    def __init__(self, maxlen: int = TRACE_WINDOW):
+        self._traces: deque[Trace] = deque(maxlen=maxlen)
+
+    def start(self, name: str, start: Optional[float] = None) -> Trace:
+        """A trace beginning now, or at an earlier monotonic time."""
+        return Trace(name, self, start)
+
+    def append(self, trace: Trace):
+        self._traces.append(trace)
+
+    def clear(self):
+        self._traces.clear()
+
+    def summary(self) -> dict[str, dict]:
+        """p50/p95/max per stage and for the whole command, in milliseconds."""
+        samples: dict[str, list[float]] = {}
+        for trace in self._traces:
+            for stage, duration in trace.stages().items():
+                samples.setdefault(stage, []).append(duration)
+            samples.setdefault("total", []).append(trace.total)
+        summary = {}
+        for stage, durations in samples.items():
+            durations.sort()
+            summary[stage] = {
+                "count": len(durations),
+                **{
+                    key: round(percentile(durations, q) * 1000, 3)
+                    for key, q in (("p50", 0.5), ("p95", 0.95), ("max", 1.0))
+                },
+            }
+        return summary
+
+    def recent(self, count: int = 20) -> list[dict]:
+        return [
+            {
+                "name": trace.name,
+                "success": trace.success,
+                "total_ms": round(trace.total * 1000, 3),
+                "stages_ms": {stage: round(d * 1000, 3) for stage, d in trace.stages().items()},
+            }
+            for trace in list(self._traces)[-count:]
+        ]
+
+    def as_dict(self) -> dict:
+        return {"traces": len(self._traces), "stages": self.summary(), "recent": self.recent()}
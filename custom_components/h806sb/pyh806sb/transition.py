@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_DEVICE_BRIGHTNESS = 31
+# Fastest frame rate of a ramp, whatever the command gap is set to
+MIN_FRAME_INTERVAL = 0.05
+
+
+def _cie_luminance(brightness: int) -> float:
+    """Relative luminance (0..1) of a perceived lightness given as 0..255 (CIE 1931)."""
+    lightness = brightness / 255 * 100
+    if lightness <= 8:
+        return lightness / 903.3
+    return ((lightness + 16) / 116) ** 3
+
+
+def _device_level(brightness: int) -> int:
+    if brightness <= 0:
+        return 0
+    # Any non-zero brightness keeps the strip lit
+    return max(1, round(_cie_luminance(brightness) * MAX_DEVICE_BRIGHTNESS))
+
+
+# Home Assistant brightness (perceptual, 0..255) -> device brightness (0..31)
+PERCEPTUAL_CURVE: Tuple[int, ...] = tuple(_device_level(b) for b in range(256))
+
+Step = Tuple[float, int]
+
+
+def plan_transition(start: int, end: int, duration: float, min_interval: float) -> list[Step]:
+    """Device levels of a perceptually linear ramp and their offsets in seconds.
+
+    Only brightness values where the device level actually changes produce
+    a step, at the offset where the ramp reaches it. A change less than
+    min_interval after the previous step is left out: the next step sent
+    carries its later level. The last step is always the target level at
+    the full duration.
+    """
+    start = max(0, min(255, start))
+    end = max(0, min(255, end))
+    target = PERCEPTUAL_CURVE[end]
+    if duration <= 0 or start == end:
+        return [(0.0, target)]
+
+    direction = 1 if end > start else -1
+    span = abs(end - start)
+    steps: list[Step] = []
+    level = PERCEPTUAL_CURVE[start]
+    for brightness in range(start + direction, end + direction, direction):
+        new_level = PERCEPTUAL_CURVE[brightness]
+        if new_level == level:
+            continue
+        level = new_level
+        offset = abs(brightness - start) / span * duration
+        if steps and offset - steps[-1][0] < min_interval:
+            # Never sent early: a later step, or the target, supersedes it
+            continue
+        steps.append((offset, level))
+
+    # The ramp ends exactly at the target, at the requested time
+    if steps and duration - steps[-1][0] < min_interval:
+        steps.pop()
+    steps.append((duration, target))
+    return steps
+
+
+class TransitionEngine:
+    """Plays ramps of one controller on a monotonic-clock frame schedule.
+
+    Frames that are already late are skipped in favour of the newest due
+    one. Starting a new ramp or cancelling stops the current one at once.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, steps: list[Step], send: Callable[[int], Awaitable[bool]]):
+        self.cancel()
+        self._task = asyncio.create_task(self._async_play(steps, send))
+
+    def cancel(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _async_play(self, steps: list[Step], send: Callable[[int], Awaitable[bool]]):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        i = 0
+        while i < len(steps):
+            delay = start + steps[i][0] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Late: jump to the newest step that is already due
+            elapsed = loop.time() - start
+            while i + 1 < len(steps) and steps[i + 1][0] <= elapsed:
+                i += 1
+            if not await send(steps[i][1]):
+                _LOGGER.debug("Transition stopped: step %s was not delivered", i)
+                return
+            i += 1
@@ -0,0 +1,255 @@
+import asyncio
+import socket
+import logging
+import time
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from .airtime import AirtimeLimiter
+from .capture import DIRECTION_IN, DIRECTION_OUT, PacketCapture
+from .codec import parse_reply
+from .priority import PRIORITY_BACKGROUND
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_PORT = 4626
+LISTEN_PORT = 4882
+
+
+class Response(NamedTuple):
+    data: bytes
+    addr: Tuple[str, int]
+    rtt: float
+
+
+class H806SBTransport(asyncio.DatagramProtocol):
+    """Single UDP endpoint on port 4882 shared by every LedController.
+
+    Incoming replies are routed to waiting futures by source IP and, when
+    the reply carries a name, by serial number. The device answers every
+    probe once, so a reply resolves only the oldest waiter of its device:
+    concurrent probes each get their own answer, and a reply that arrives
+    before a waiter was registered is never taken for that waiter's.
+    """
+
+    def __init__(self, port: int = LISTEN_PORT):
+        self._port = port
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._start_lock = asyncio.Lock()
+        self._waiters_by_host: dict[str, list[asyncio.Future]] = {}
+        self._waiters_by_serial: dict[str, list[asyncio.Future]] = {}
+        self._listeners: list[Callable[[bytes, Tuple[str, int]], None]] = []
+        self._host_listeners: dict[str, list[Callable[[bytes, Tuple[str, int]], None]]] = {}
+        # Opt-in record of every datagram in and out
+        self.capture: Optional[PacketCapture] = None
+        # Optional pacing of everything sent to the devices, per subnet
+        self.limiter: Optional[AirtimeLimiter] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    @property
+    def local_port(self) -> Optional[int]:
+        if not self.is_running:
+            return None
+        return self._transport.get_extra_info("sockname")[1]
+
+    def _create_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.setblocking(False)
+        try:
+            sock.bind(('0.0.0.0', self._port))
+            _LOGGER.debug("Shared socket bound to port %s", self._port)
+        except OSError as e:
+            _LOGGER.warning("Could not bind to port %s: %s, using random port", self._port, e)
+            try:
+                sock.bind(('0.0.0.0', 0))
+            except OSError:
+                sock.close()
+                raise
+        return sock
+
+    async def async_start(self):
+        """Open the shared endpoint (no-op if it is already open)."""
+        async with self._start_lock:
+            if self.is_running:
+                return
+            loop = asyncio.get_running_loop()
+            sock = self._create_socket()
+            try:
+                await loop.create_datagram_endpoint(lambda: self, sock=sock)
+            except Exception:
+                sock.close()
+                raise
+            _LOGGER.debug("Shared transport listening on port %s", self.local_port)
+
+    def close(self):
+        """Close the endpoint and fail everything still waiting for a reply."""
+        if self._transport:
+            _LOGGER.debug("Closing shared transport")
+            self._transport.close()
+            self._transport = None
+        for waiters in (*self._waiters_by_host.values(), *self._waiters_by_serial.values()):
+            for fut in waiters:
+                if not fut.done():
+                    fut.cancel()
+        self._waiters_by_host.clear()
+        self._waiters_by_serial.clear()
+
+    def sendto(self, data: bytes, addr: Tuple[str, int]):
+        if not self.is_running:
+            raise OSError("Shared transport is not running")
+        self._transport.sendto(data, addr)
+        if self.capture is not None:
+            self.capture.record(DIRECTION_OUT, addr, data)
+
+    async def async_pace(self, host: str, priority: int = PRIORITY_BACKGROUND, count: int = 1):
+        """Wait until count datagrams to host fit in the airtime budget."""
+        if self.limiter is not None:
+            for _ in range(count):
+                await self.limiter.async_acquire(host, priority)
+
+    def charge(self, host: str, count: int = 1):
+        """Account for datagrams sent to host without pacing (aligned bursts)."""
+        if self.limiter is not None:
+            self.limiter.charge(host, count)
+
+    async def async_request(
+        self,
+        data: bytes,
+        addr: Tuple[str, int],
+        timeout: float,
+        serial: Optional[str] = None,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> Optional[Response]:
+        """Send a datagram and wait for the reply from that host (or serial)."""
+        await self.async_pace(addr[0], priority)
+        fut = self.register_waiter(addr[0], serial)
+        try:
+            sent = time.monotonic()
+            self.sendto(data, addr)
+            reply_data, reply_addr = await asyncio.wait_for(fut, timeout)
+            return Response(reply_data, reply_addr, time.monotonic() - sent)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.unregister_waiter(fut, addr[0], serial)
+
+    async def async_request_many(
+        self,
+        requests: list[Tuple[bytes, Tuple[str, int], Optional[str]]],
+        timeout: float,
+    ) -> list[Optional[Response]]:
+        """Send all datagrams back to back and collect replies in one timeout window.
+
+        With an airtime limiter the datagrams are spread out at its rate
+        instead; every reply is still timed from its own datagram.
+        """
+        futures = []
+        arrived: dict[asyncio.Future, float] = {}
+
+        def on_reply(fut):
+            arrived[fut] = time.monotonic()
+
+        try:
+            for data, addr, serial in requests:
+                await self.async_pace(addr[0])
+                fut = self.register_waiter(addr[0], serial)
+                fut.add_done_callback(on_reply)
+                futures.append((fut, addr[0], serial, time.monotonic()))
+                self.sendto(data, addr)
+            if futures:
+                await asyncio.wait([fut for fut, _, _, _ in futures], timeout=timeout)
+            return [
+                Response(*fut.result(), arrived.get(fut, time.monotonic()) - sent)
+                if fut.done() and not fut.cancelled() else None
+                for fut, _, _, sent in futures
+            ]
+        finally:
+            for fut, host, serial, _ in futures:
+                self.unregister_waiter(fut, host, serial)
+
+    def register_waiter(self, host: str, serial: Optional[str] = None) -> asyncio.Future:
+        """Create a future resolved by a later reply from host or serial.
+
+        Register it right before sending the probe it waits for.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters_by_host.setdefault(host, []).append(fut)
+        if serial:
+            self._waiters_by_serial.setdefault(serial.lower(), []).append(fut)
+        return fut
+
+    def unregister_waiter(self, fut: asyncio.Future, host: str, serial: Optional[str] = None):
+        self._discard(self._waiters_by_host, host, fut)
+        if serial:
+            self._discard(self._waiters_by_serial, serial.lower(), fut)
+
+    @staticmethod
+    def _discard(waiters: dict, key: str, fut: asyncio.Future):
+        futures = waiters.get(key)
+        if not futures:
+            return
+        try:
+            futures.remove(fut)
+        except ValueError:
+            pass
+        if not futures:
+            del waiters[key]
+
+    def add_listener(self, listener: Callable[[bytes, Tuple[str, int]], None]) -> Callable[[], None]:
+        """Call listener for every received datagram; returns the remover."""
+        self._listeners.append(listener)
+
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+    def add_host_listener(
+        self, host: str, listener: Callable[[bytes, Tuple[str, int]], None]
+    ) -> Callable[[], None]:
+        """Call listener for every datagram received from host; returns the remover."""
+        self._host_listeners.setdefault(host, []).append(listener)
+
+        def remove():
+            listeners = self._host_listeners.get(host)
+            if listeners and listener in listeners:
+                listeners.remove(listener)
+                if not listeners:
+                    del self._host_listeners[host]
+
+        return remove
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def connection_lost(self, exc):
+        if exc:
+            _LOGGER.warning("Shared transport lost: %s", exc)
+        self._transport = None
+
+    def error_received(self, exc):
+        _LOGGER.debug("Shared transport error: %s", exc)
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        if self.capture is not None:
+            self.capture.record(DIRECTION_IN, addr, data)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Received from %s:%s: %s", addr[0], addr[1], data.hex())
+        if (reply := parse_reply(data)) is not None:
+            waiters = list(self._waiters_by_host.get(addr[0], ()))
+            if reply.serial:
+                waiters.extend(self._waiters_by_serial.get(reply.serial, ()))
+            # Oldest first: an earlier probe's answer must not resolve a later one
+            for fut in waiters:
+                if not fut.done():
+                    fut.set_result((data, addr))
+                    break
+        for listener in self._host_listeners.get(addr[0], ()):
+            listener(data, addr)
+        for listener in list(self._listeners):
+            listener(data, addr)
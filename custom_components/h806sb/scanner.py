@@ -0,0 +1,86 @@
+"""Background discovery of H806SB devices on every local subnet."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.components import network
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.event import async_track_time_interval
+
+from .cache import async_get_device_cache
+from .const import DATA_TRANSPORT, DISCOVERY_INTERVAL, DOMAIN
+from .endpoint import async_get_transport
+from .pyh806sb.codec import normalize_serial
+from .pyh806sb.discovery import DiscoveredDevice, H806SBDiscovery
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_get_broadcast_addresses(hass: HomeAssistant) -> list[str]:
+    """Directed broadcast address of every enabled IPv4 interface (and 255.255.255.255)."""
+    addresses = await network.async_get_ipv4_broadcast_addresses(hass)
+    return sorted(str(address) for address in addresses)
+
+
+async def async_scan(hass: HomeAssistant, timeout: float = 2) -> list[DiscoveredDevice]:
+    """Discover devices on all subnets at once through the shared endpoint."""
+    try:
+        transport = await async_get_transport(hass)
+    except OSError as err:
+        _LOGGER.error("Discovery failed: %s", err)
+        return []
+    discovery = H806SBDiscovery(
+        transport,
+        broadcast_addresses=await async_get_broadcast_addresses(hass),
+    )
+    try:
+        return await discovery.discover_devices(timeout)
+    finally:
+        # A scan from the config flow before any device is set up must not
+        # leave the endpoint open
+        if not any(
+            entry.state in (ConfigEntryState.LOADED, ConfigEntryState.SETUP_IN_PROGRESS)
+            for entry in hass.config_entries.async_entries(DOMAIN)
+        ) and (transport := hass.data.pop(DATA_TRANSPORT, None)):
+            transport.close()
+
+
+@callback
+def async_start_scanner(hass: HomeAssistant) -> CALLBACK_TYPE:
+    """Scan now and every DISCOVERY_INTERVAL, offering new devices as discovery flows.
+
+    Scans use the shared endpoint, so the scanner runs while entries are
+    loaded: the returned callback stops it.
+    """
+
+    async def _async_scan(now: datetime | None = None) -> None:
+        devices = await async_scan(hass)
+        cache = await async_get_device_cache(hass)
+        for device in devices:
+            serial = normalize_serial(device.serial.hex())
+            cache.async_update(serial, host=device.ip, name=device.name, seen=True)
+            # Flows for configured or ignored serials abort on their unique_id
+            discovery_flow.async_create_flow(
+                hass,
+                DOMAIN,
+                context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                data={"ip": device.ip, "serial": serial, "name": device.name},
+            )
+        _LOGGER.debug("Background discovery found %s devices", len(devices))
+
+    task = hass.async_create_background_task(_async_scan(), f"{DOMAIN} discovery")
+    unsub = async_track_time_interval(
+        hass, _async_scan, DISCOVERY_INTERVAL, cancel_on_shutdown=True
+    )
+
+    @callback
+    def _async_stop() -> None:
+        unsub()
+        task.cancel()
+
+    return _async_stop
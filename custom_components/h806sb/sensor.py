@@ -0,0 +1,126 @@
+"""Diagnostic sensors of the H806SB Led Controller integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .pyh806sb.controller import LedController
+from .pyh806sb.metrics import ControllerMetrics
+
+# Metrics live in memory, polling them is free
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+def _ms(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class H806SBSensorEntityDescription(SensorEntityDescription):
+    """Describes an H806SB metrics sensor."""
+
+    value_fn: Callable[[ControllerMetrics], float | int | None]
+
+
+SENSORS: tuple[H806SBSensorEntityDescription, ...] = (
+    H806SBSensorEntityDescription(
+        key="packets_sent",
+        name="Packets sent",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.packets_sent,
+    ),
+    H806SBSensorEntityDescription(
+        key="send_errors",
+        name="Send errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.send_errors,
+    ),
+    H806SBSensorEntityDescription(
+        key="probe_timeouts",
+        name="Probe timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.probe_timeouts,
+    ),
+    H806SBSensorEntityDescription(
+        key="socket_reinits",
+        name="Socket reinitializations",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.socket_reinits,
+    ),
+    H806SBSensorEntityDescription(
+        key="probe_rtt_p50",
+        name="Probe RTT p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _ms(metrics.rtt_percentiles()["p50"]),
+    ),
+    H806SBSensorEntityDescription(
+        key="probe_rtt_p95",
+        name="Probe RTT p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _ms(metrics.rtt_percentiles()["p95"]),
+    ),
+    H806SBSensorEntityDescription(
+        key="probe_rtt_max",
+        name="Probe RTT max",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _ms(metrics.rtt_max),
+    ),
+    H806SBSensorEntityDescription(
+        key="queue_depth",
+        name="Command queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.queue_depth,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Setting up the metrics sensors."""
+    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+    async_add_entities(
+        H806SBMetricSensor(controller, entry, description) for description in SENSORS
+    )
+
+
+class H806SBMetricSensor(SensorEntity):
+    """Performance counter of one controller."""
+
+    entity_description: H806SBSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        controller: LedController,
+        entry: ConfigEntry,
+        description: H806SBSensorEntityDescription,
+    ) -> None:
+        """Initialization."""
+        self.entity_description = description
+        self._controller = controller
+        self._attr_name = f"{entry.data.get('name', 'H806SB')} {description.name}"
+        self._attr_unique_id = f"h806sb_{entry.unique_id or entry.entry_id}_{description.key}"
+
+    async def async_update(self) -> None:
+        """Read the current value from the controller metrics."""
+        self._attr_native_value = self.entity_description.value_fn(self._controller.metrics)
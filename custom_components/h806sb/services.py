@@ -0,0 +1,149 @@
+"""Services for the H806SB Led Controller integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.light import ATTR_BRIGHTNESS
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .const import (
+    ATTR_DELAY,
+    ATTR_ENTITIES,
+    ATTR_SPEED,
+    ATTR_STATE,
+    DEFAULT_SCENE_DELAY,
+    DOMAIN,
+    SERVICE_APPLY_SCENE,
+    SERVICE_SET_MANY,
+)
+from .pyh806sb.controller import async_send_many
+from .light import to_device_brightness
+
+_LOGGER = logging.getLogger(__name__)
+
+SET_MANY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_STATE, default=True): cv.boolean,
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(ATTR_SPEED): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+
+APPLY_SCENE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITIES): {
+            cv.entity_id: vol.Schema(
+                {
+                    vol.Optional(ATTR_STATE, default=True): cv.boolean,
+                    vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+                    vol.Optional(ATTR_SPEED): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                }
+            )
+        },
+        vol.Optional(ATTR_DELAY, default=DEFAULT_SCENE_DELAY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=5)
+        ),
+    }
+)
+
+
+async def _async_send_states(
+    hass: HomeAssistant,
+    states: dict[str, dict[str, Any]],
+    at: float | None = None,
+) -> dict[str, dict]:
+    """Send one packet per light with async_send_many and update the lights."""
+    registry = er.async_get(hass)
+    entries = hass.data.get(DOMAIN, {})
+
+    results: dict[str, dict] = {}
+    commands = []
+    targets = []
+    for entity_id, state in states.items():
+        entity_entry = registry.async_get(entity_id)
+        data = entries.get(entity_entry.config_entry_id) if entity_entry else None
+        light = data.get("light") if data else None
+        if light is None:
+            results[entity_id] = {"success": False, "error": "unknown_entity"}
+            continue
+        if not light.reachable:
+            results[entity_id] = {"success": False, "error": "unavailable"}
+            continue
+
+        is_on = state[ATTR_STATE]
+        brightness = state.get(ATTR_BRIGHTNESS)
+        level = brightness if brightness is not None else light.brightness or 255
+        speed = state.get(ATTR_SPEED, light.speed)
+        # Same packets as async_turn_on / async_turn_off
+        device_brightness = to_device_brightness(level) if is_on else 0
+        commands.append((data["controller"], device_brightness, speed, True))
+        targets.append((entity_id, light, is_on, level))
+
+    sent = await async_send_many(commands, at)
+
+    for (entity_id, light, is_on, level), offset in zip(targets, sent):
+        if offset is None:
+            results[entity_id] = {"success": False, "error": "send_failed"}
+            continue
+        results[entity_id] = {"success": True, "offset_ms": round(offset * 1000, 3)}
+        light.async_apply_group_state(is_on, level if is_on else None)
+    return results
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_set_many(call: ServiceCall) -> ServiceResponse:
+        """Send one state to many lights in a single burst."""
+        state = {
+            key: call.data[key]
+            for key in (ATTR_STATE, ATTR_BRIGHTNESS, ATTR_SPEED)
+            if key in call.data
+        }
+        # One packet per controller: drop repeated entity ids
+        results = await _async_send_states(
+            hass, {entity_id: state for entity_id in call.data[ATTR_ENTITY_ID]}
+        )
+        _LOGGER.debug("set_many results: %s", results)
+        return {"results": results}
+
+    async def async_apply_scene(call: ServiceCall) -> ServiceResponse:
+        """Stage a state per light and release all packets at one moment."""
+        at = hass.loop.time() + call.data[ATTR_DELAY]
+        results = await _async_send_states(hass, call.data[ATTR_ENTITIES], at)
+        offsets = [result["offset_ms"] for result in results.values() if result["success"]]
+        response = {
+            "results": results,
+            # Delay of the first packet after the scheduled moment, and
+            # spread between the first and the last one
+            "late_ms": min(offsets, default=None),
+            "skew_ms": round(max(offsets) - min(offsets), 3) if offsets else None,
+        }
+        _LOGGER.debug("apply_scene: %s", response)
+        return response
+
+    for service, handler, schema in (
+        (SERVICE_SET_MANY, async_set_many, SET_MANY_SCHEMA),
+        (SERVICE_APPLY_SCENE, async_apply_scene, APPLY_SCENE_SCHEMA),
+    ):
+        if not hass.services.has_service(DOMAIN, service):
+            hass.services.async_register(
+                DOMAIN,
+                service,
+                handler,
+                schema=schema,
+                supports_response=SupportsResponse.OPTIONAL,
+            )
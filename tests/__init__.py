@@ -0,0 +1,60 @@
+"""Tests for the H806SB Led Controller integration."""
+
+import asyncio
+from typing import Callable
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.h806sb.const import DOMAIN
+from custom_components.h806sb.pyh806sb.codec import normalize_serial
+
+
+async def async_setup_device(
+    hass: HomeAssistant,
+    host: str = "127.0.0.1",
+    serial: str = "000c3951",
+    name: str = "Strip",
+    **options,
+) -> MockConfigEntry:
+    """Set up an entry with its light only, without background discovery."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=normalize_serial(serial),
+        data={"host": host, "serial_number": serial, "name": name, **options},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.h806sb.async_start_scanner"),
+        patch("custom_components.h806sb._PLATFORMS", ["light"]),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+class RecordingDatagramTransport(asyncio.DatagramTransport):
+    """Socket stand-in that keeps what is sent; replies are fed by the test."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent: list[bytes] = []
+        self.destinations: list = []
+
+    def sendto(self, data, addr=None):
+        self.sent.append(bytes(data))
+        self.destinations.append(addr)
+
+    def is_closing(self) -> bool:
+        return False
+
+    def get_extra_info(self, name, default=None):
+        return ("0.0.0.0", 4882) if name == "sockname" else default
+
+
+async def async_wait_for(condition: Callable[[], bool], timeout: float = 1.0) -> None:
+    """Let datagrams travel over loopback until condition holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
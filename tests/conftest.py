@@ -0,0 +1,30 @@
+"""Fixtures for H806SB tests."""
+
+import pytest
+
+from custom_components.h806sb.pyh806sb.transport import H806SBTransport
+from tools.emulator import DeviceEmulator
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load custom_components/h806sb in every test."""
+    yield
+
+
+@pytest.fixture
+async def emulator(socket_enabled):
+    """Two loopback devices (127.1.0.1, 127.1.0.2) without impairments."""
+    async with DeviceEmulator(count=2, discovery_host=None, seed=0) as emulator:
+        yield emulator
+
+
+@pytest.fixture
+async def transport(socket_enabled):
+    """Shared endpoint on a free port, so tests never compete for 4882."""
+    transport = H806SBTransport(port=0)
+    await transport.async_start()
+    yield transport
+    transport.close()
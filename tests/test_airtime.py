@@ -0,0 +1,100 @@
+"""Tests for the per-subnet airtime limiter."""
+
+import asyncio
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.h806sb.const import CONF_AIRTIME_RATE, DATA_TRANSPORT
+from custom_components.h806sb.pyh806sb.airtime import DEFAULT_AIRTIME_RATE, AirtimeLimiter
+from custom_components.h806sb.pyh806sb.priority import PRIORITY_BACKGROUND, PRIORITY_USER
+
+from . import async_setup_device
+
+
+async def test_tokens_are_paced_at_the_rate() -> None:
+    limiter = AirtimeLimiter(50, burst=1)
+
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.async_acquire("10.0.0.1")
+
+    # The first token is in the bucket, each further one takes 1/rate
+    assert time.monotonic() - start >= 4 / 50 * 0.9
+    assert limiter.as_dict()["buckets"]["10.0.0.0/24"]["sent"] == 5
+
+
+async def test_user_commands_overtake_waiting_probes() -> None:
+    limiter = AirtimeLimiter(50, burst=1)
+    await limiter.async_acquire("10.0.0.1")
+    order = []
+
+    async def acquire(name, priority):
+        await limiter.async_acquire("10.0.0.2", priority)
+        order.append(name)
+
+    await asyncio.gather(
+        acquire("probe", PRIORITY_BACKGROUND),
+        acquire("probe", PRIORITY_BACKGROUND),
+        acquire("command", PRIORITY_USER),
+    )
+
+    assert order == ["command", "probe", "probe"]
+
+
+async def test_charged_burst_is_paid_back() -> None:
+    """Packets sent without waiting delay the traffic that follows."""
+    limiter = AirtimeLimiter(100, burst=1)
+    limiter.charge("10.0.0.1", 5)
+
+    start = time.monotonic()
+    await limiter.async_acquire("10.0.0.1")
+
+    assert time.monotonic() - start >= 0.05 * 0.9
+    stats = limiter.as_dict()["buckets"]["10.0.0.0/24"]
+    assert stats["sent"] == 6
+    assert stats["deferred"] == 1
+
+
+async def test_rates_are_per_subnet() -> None:
+    """A slow device only slows down its own subnet."""
+    limiter = AirtimeLimiter()
+    limiter.set_rates({"10.0.0.1": 10, "10.0.0.2": 40, "10.0.1.1": 0, "10.0.2.1": 0, "10.0.2.2": 20})
+
+    assert limiter._subnet_rate("10.0.0.0/24") == 10
+    assert limiter._subnet_rate("10.0.1.0/24") == 0
+    assert limiter._subnet_rate("10.0.2.0/24") == 20
+    assert limiter._subnet_rate("10.0.3.0/24") == DEFAULT_AIRTIME_RATE
+
+    start = time.monotonic()
+    for _ in range(20):
+        await limiter.async_acquire("10.0.1.1")
+    assert time.monotonic() - start < 0.05
+    assert limiter.as_dict()["buckets"]["10.0.1.0/24"]["limit_pps"] == 0
+
+
+async def test_new_rates_apply_to_waiting_senders() -> None:
+    limiter = AirtimeLimiter(1, burst=1)
+    await limiter.async_acquire("10.0.0.1")
+    waiting = asyncio.ensure_future(limiter.async_acquire("10.0.0.1"))
+    await asyncio.sleep(0)
+
+    limiter.set_rates({"10.0.0.1": 0})
+
+    await asyncio.wait_for(waiting, 0.1)
+
+
+async def test_entries_set_the_rate_of_their_subnet(hass: HomeAssistant, socket_enabled) -> None:
+    first = await async_setup_device(hass, "10.0.0.1", "0c0001", "First", **{CONF_AIRTIME_RATE: 10})
+    await async_setup_device(hass, "10.0.1.1", "0c0002", "Second", **{CONF_AIRTIME_RATE: 200})
+    limiter = hass.data[DATA_TRANSPORT].limiter
+
+    assert limiter._subnet_rate("10.0.0.0/24") == 10
+    assert limiter._subnet_rate("10.0.1.0/24") == 200
+
+    assert await hass.config_entries.async_unload(first.entry_id)
+    assert limiter._subnet_rate("10.0.0.0/24") == DEFAULT_AIRTIME_RATE
+
+    for entry in hass.config_entries.async_entries():
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
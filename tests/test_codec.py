@@ -0,0 +1,68 @@
+"""Tests for the H806SB frame layouts."""
+
+import pytest
+
+from custom_components.h806sb.pyh806sb.codec import (
+    PROBE_PACKET,
+    ControlFrame,
+    encode_serial,
+    normalize_serial,
+    parse_control,
+    parse_reply,
+)
+
+
+def test_control_frame_layout() -> None:
+    """16 bytes with the serial in the last four, little-endian."""
+    frame = ControlFrame()
+    frame.set_serial(encode_serial("0c3951"))
+    packet = bytes(frame.pack(300, 20, 31, True))
+
+    assert len(packet) == 16
+    assert packet == bytes.fromhex("fbc1" "2c" "14" "1f" "01" "00ae" "00000000" "51390c00")
+    assert parse_control(packet) == (44, 20, 31, True, bytes.fromhex("51390c00"))
+
+
+def test_control_frame_clamps_fields() -> None:
+    packet = bytes(ControlFrame().pack(1, 0, 99, False))
+
+    assert parse_control(packet) == (1, 1, 31, False, bytes(4))
+
+
+def test_control_frame_buffer_is_reused() -> None:
+    """Packing patches one buffer in place: callers copy it to keep it."""
+    frame = ControlFrame()
+    first = frame.pack(1, 20, 10, True)
+    second = frame.pack(2, 20, 20, True)
+
+    assert first is second
+    assert parse_control(bytes(first)).counter == 2
+
+
+def test_probe_packet() -> None:
+    assert PROBE_PACKET == bytes.fromhex("ab01" "0002" "00000000" "00000000")
+
+
+@pytest.mark.parametrize(
+    ("data", "name", "serial"),
+    [
+        (b"\xab\x02H806SB_0C3951\x00\x00\x00", "H806SB_0C3951", "0c3951"),
+        (b"\xab\x02H806SB_0c3951", "H806SB_0c3951", "0c3951"),
+        (b"\xab\x02H806SB\x00", "H806SB", None),
+        (b"\xab\x02H806SB_zz\x00", "H806SB_zz", None),
+    ],
+)
+def test_parse_reply(data: bytes, name: str, serial: str | None) -> None:
+    assert parse_reply(data) == (name, serial)
+
+
+def test_parse_reply_rejects_other_frames() -> None:
+    assert parse_reply(PROBE_PACKET) is None
+    assert parse_reply(b"\xab") is None
+
+
+def test_serials() -> None:
+    assert encode_serial("0c3951") == bytes.fromhex("51390c00")
+    assert normalize_serial("0C3951") == "000c3951"
+    with pytest.raises(ValueError):
+        encode_serial("0102030405")
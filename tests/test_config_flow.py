@@ -0,0 +1,60 @@
+"""Tests for the H806SB config flow."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.h806sb.const import CONF_ACTION, CONF_MANUAL_SETUP, DOMAIN
+
+
+@pytest.fixture(autouse=True)
+def no_network():
+    """Created entries are not set up and nothing is scanned."""
+    with (
+        patch("custom_components.h806sb.async_start_scanner"),
+        patch("custom_components.h806sb.async_setup_entry", return_value=True),
+    ):
+        yield
+
+
+async def test_manual_serial_matches_discovery(hass: HomeAssistant) -> None:
+    """A typed serial and the same device found by the scanner share a unique_id."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_ACTION: CONF_MANUAL_SETUP}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"host": "192.168.1.20", "serial_number": "0C3951", "name": "Strip"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "000c3951"
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+        data={"ip": "192.168.1.20", "serial": "000c3951", "name": "Strip"},
+    )
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_manual_invalid_serial(hass: HomeAssistant) -> None:
+    """A serial that is not hex is rejected on the form."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_ACTION: CONF_MANUAL_SETUP}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"host": "192.168.1.20", "serial_number": "not-hex", "name": "Strip"},
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"serial_number": "invalid_serial"}
@@ -0,0 +1,109 @@
+"""Tests for confirmed sends of the LED controller."""
+
+import asyncio
+
+import pytest
+
+from custom_components.h806sb.pyh806sb.codec import PROBE_HEADER, parse_control
+from custom_components.h806sb.pyh806sb.controller import LedController, async_send_many
+from custom_components.h806sb.pyh806sb.transport import DEVICE_PORT, H806SBTransport
+
+from . import RecordingDatagramTransport
+
+HOST = "10.0.0.1"
+REPLY = b"\xab\x02H806SB_0c3951\x00"
+
+
+@pytest.fixture
+def wire():
+    return RecordingDatagramTransport()
+
+
+@pytest.fixture
+def controller(wire):
+    transport = H806SBTransport()
+    transport.connection_made(wire)
+    controller = LedController(HOST, transport)
+    controller.rtt._rto = 0.05
+    return controller
+
+
+def _controls(wire) -> list[int]:
+    return [control.counter for data in wire.sent if (control := parse_control(data))]
+
+
+def _probes(wire) -> int:
+    return sum(1 for data in wire.sent if data.startswith(PROBE_HEADER))
+
+
+async def _until_sent(wire, probes: int):
+    while _probes(wire) < probes:
+        await asyncio.sleep(0)
+
+
+async def test_answered_frame_is_sent_once_more(controller, wire) -> None:
+    """A reply proves reachability only: the frame goes out again, same counter."""
+    send = asyncio.ensure_future(controller.async_send_confirmed(20, 20, True))
+    await _until_sent(wire, 1)
+    controller._transport.datagram_received(REPLY, (HOST, DEVICE_PORT))
+
+    assert await send
+    assert _controls(wire) == [1, 1]
+
+
+async def test_reply_before_probe_does_not_confirm(controller, wire) -> None:
+    """A late reply to an earlier probe is not taken for this attempt's."""
+    earlier = controller._transport.register_waiter(HOST)
+    send = asyncio.ensure_future(controller.async_send_confirmed(20, 20, True, attempts=1))
+    await _until_sent(wire, 1)
+    # Answers the probe that was sent first
+    controller._transport.datagram_received(REPLY, (HOST, DEVICE_PORT))
+
+    assert earlier.done()
+    assert not await send
+    assert _controls(wire) == [1]
+
+
+async def test_other_datagrams_do_not_confirm(controller, wire) -> None:
+    send = asyncio.ensure_future(controller.async_send_confirmed(20, 20, True, attempts=1))
+    await _until_sent(wire, 1)
+    controller._transport.datagram_received(b"\xfb\xc1" + bytes(14), (HOST, DEVICE_PORT))
+
+    assert not await send
+
+
+async def test_unanswered_attempts_keep_the_counter(controller, wire) -> None:
+    send = asyncio.ensure_future(controller.async_send_confirmed(20, 20, True, attempts=3))
+    await _until_sent(wire, 3)
+    controller._transport.datagram_received(REPLY, (HOST, DEVICE_PORT))
+
+    assert await send
+    assert _controls(wire) == [1, 1, 1, 1]
+    assert controller._command_counter == 1
+
+
+async def test_confirmed_send_reaches_emulator(emulator, transport) -> None:
+    device = emulator.devices[0]
+    controller = LedController(device.ip, transport)
+
+    assert await controller.async_send_confirmed(20, 20, True)
+    await asyncio.sleep(0.05)
+
+    assert device.brightness == 20
+    assert [frame.data[2] for frame in device.control_frames] == [1, 1]
+    await controller.async_close()
+
+
+async def test_staged_packet_is_packed_at_release(controller, wire) -> None:
+    """A command sent while a scene is staged does not share its counter."""
+    controller.start_transition([(1.0, 5), (2.0, 31)], 20)
+    loop = asyncio.get_running_loop()
+    staged = asyncio.ensure_future(async_send_many([(controller, 20, 20, True)], loop.time() + 0.05))
+    await asyncio.sleep(0)
+    # Staging stops the ramp, before anything is released
+    assert not controller._transition.running
+
+    assert await controller.async_send_packet(10, 20, True)
+    assert await staged == [pytest.approx(0, abs=0.05)]
+    assert _controls(wire) == [1, 2]
+    assert controller._command_counter == 2
@@ -0,0 +1,92 @@
+"""Tests for the fleet availability sweep."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.h806sb.coordinator import (
+    MAX_RELOCATE_COOLDOWN,
+    RELOCATE_COOLDOWN,
+    H806SBCoordinator,
+    H806SBFleet,
+)
+from custom_components.h806sb.pyh806sb.controller import LedController
+from custom_components.h806sb.pyh806sb.schedule import ProbeSchedule
+from custom_components.h806sb.pyh806sb.transport import H806SBTransport
+
+from . import RecordingDatagramTransport
+
+
+class _FakeCoordinator:
+    def __init__(self):
+        self.schedule = ProbeSchedule(interval=60)
+        self.schedule.probe_now()
+        self.controller = SimpleNamespace(priority=SimpleNamespace(busy=False))
+        self.batches = 0
+
+    def async_begin_batch(self):
+        self.batches += 1
+
+    def async_end_batch(self):
+        pass
+
+
+async def test_overlapping_sweeps_do_not_probe_twice(hass: HomeAssistant) -> None:
+    """A sweep that outlasts the interval keeps its devices to itself."""
+    fleet = H806SBFleet(hass)
+    coordinator = _FakeCoordinator()
+    fleet._coordinators["entry"] = coordinator
+    probed = []
+    release = asyncio.Event()
+
+    async def _check_many(controllers):
+        probed.append(controllers)
+        await release.wait()
+        return [True] * len(controllers)
+
+    with patch(
+        "custom_components.h806sb.coordinator.async_check_availability_many", _check_many
+    ):
+        first = hass.async_create_task(fleet._async_sweep())
+        await asyncio.sleep(0)
+        await asyncio.wait_for(fleet._async_sweep(), 1)
+        assert len(probed) == 1
+
+        release.set()
+        await first
+        assert coordinator.batches == 1
+        assert not coordinator.schedule.is_due(time.monotonic())
+
+
+async def test_relocation_backs_off_for_a_dead_device(hass: HomeAssistant) -> None:
+    """Searches for a device that is not found get rarer, until it is heard again."""
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    controller = LedController("10.0.0.1", transport)
+    controller.set_serial_number("0c3951")
+    coordinator = H806SBCoordinator(hass, controller)
+
+    with patch(
+        "custom_components.h806sb.coordinator.H806SBDiscovery.async_locate",
+        return_value=None,
+    ) as locate:
+        cooldowns = []
+        for _ in range(7):
+            coordinator._last_relocate = float("-inf")
+            coordinator._handle_availability(False)
+            await hass.async_block_till_done()
+            cooldowns.append(coordinator._relocate_cooldown)
+        # Within the cooldown nothing is searched
+        coordinator._handle_availability(False)
+        await hass.async_block_till_done()
+
+    assert locate.call_count == 7
+    assert cooldowns == [60, 120, 240, 480, 900, 900, 900]
+    assert cooldowns[-1] == MAX_RELOCATE_COOLDOWN
+
+    coordinator._handle_availability(True)
+    assert coordinator._relocate_cooldown == RELOCATE_COOLDOWN
+    await coordinator.async_shutdown()
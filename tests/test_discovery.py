@@ -0,0 +1,56 @@
+"""Tests for discovery and relocation by serial."""
+
+import asyncio
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.h806sb.coordinator import H806SBCoordinator
+from custom_components.h806sb.pyh806sb.controller import LedController
+from custom_components.h806sb.pyh806sb.discovery import H806SBDiscovery
+from custom_components.h806sb.pyh806sb.transport import DEVICE_PORT, H806SBTransport
+
+from . import RecordingDatagramTransport
+
+
+def _transport() -> H806SBTransport:
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    return transport
+
+
+async def test_locate_skips_foreign_replies() -> None:
+    """Replies with malformed or longer serials are not a match, nor an error."""
+    transport = _transport()
+    discovery = H806SBDiscovery(transport)
+    locate = asyncio.ensure_future(discovery.async_locate("0C3951", timeout=1))
+    await asyncio.sleep(0)
+
+    transport.datagram_received(b"\xab\x02OTHER_0102030405\x00", ("10.0.0.7", DEVICE_PORT))
+    transport.datagram_received(b"\xab\x02H806SB\x00", ("10.0.0.8", DEVICE_PORT))
+    transport.datagram_received(b"\xab\x02H806SB_0c3952\x00", ("10.0.0.9", DEVICE_PORT))
+    transport.datagram_received(b"\xab\x02H806SB_000c3951\x00", ("10.0.0.20", DEVICE_PORT))
+
+    device = await locate
+    assert device.ip == "10.0.0.20"
+
+
+async def test_relocation_searches_every_subnet(hass: HomeAssistant) -> None:
+    """The search for a lost device goes to the broadcast address of each interface."""
+    transport = _transport()
+    controller = LedController("10.0.0.1", transport)
+    controller.set_serial_number("0c3951")
+    coordinator = H806SBCoordinator(hass, controller)
+
+    with (
+        patch(
+            "custom_components.h806sb.coordinator.async_get_broadcast_addresses",
+            return_value=["10.0.0.255", "192.168.1.255"],
+        ),
+        patch.object(H806SBDiscovery, "async_locate", autospec=True, return_value=None) as locate,
+    ):
+        await coordinator._async_relocate()
+
+    discovery = locate.call_args.args[0]
+    assert discovery._broadcast_addresses == ["10.0.0.255", "192.168.1.255"]
+    await coordinator.async_shutdown()
@@ -0,0 +1,60 @@
+"""Tests for entry setup."""
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from custom_components.h806sb.cache import STORAGE_KEY, STORAGE_VERSION
+from custom_components.h806sb.const import DATA_CACHE, DOMAIN
+
+from . import async_setup_device
+
+
+@pytest.mark.parametrize(
+    ("cached", "available"),
+    [
+        (None, False),
+        ({"host": "127.0.0.1", "name": "Strip"}, False),
+        ({"host": "127.0.0.1", "last_seen": 1.0, "available": False}, False),
+        ({"host": "127.0.0.1", "last_seen": 1.0, "available": True}, True),
+    ],
+)
+async def test_initial_availability_from_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    socket_enabled,
+    cached: dict | None,
+    available: bool,
+) -> None:
+    """Only a device that was available when last heard of starts available."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"devices": {"000c3951": cached} if cached else {}},
+    }
+    entry = await async_setup_device(hass)
+
+    assert (hass.states.get("light.strip").state != STATE_UNAVAILABLE) is available
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_lost_device_is_remembered(hass: HomeAssistant, socket_enabled) -> None:
+    """A device that stops answering is stored as unavailable for the next start."""
+    entry = await async_setup_device(hass)
+    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+    cache = hass.data[DATA_CACHE]
+
+    controller._on_datagram(b"\xab\x02H806SB_0c3951\x00", ("127.0.0.1", 4626))
+    assert cache.get("000c3951")["available"] is True
+
+    with patch("custom_components.h806sb.coordinator.H806SBCoordinator._async_schedule_relocate"):
+        controller._set_lost()
+    assert cache.get("000c3951")["available"] is False
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,119 @@
+"""Tests for the H806SB light."""
+
+import time
+
+import pytest
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.const import SERVICE_TURN_ON
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Context, HomeAssistant, State
+from homeassistant.util.ulid import ulid_at_time
+from pytest_homeassistant_custom_component.common import mock_restore_cache
+
+from custom_components.h806sb.const import (
+    ATTR_REACHABLE,
+    CONF_QUEUE_OFFLINE,
+    CONF_RECONCILE_STATE,
+    CONF_TRACE_COMMANDS,
+    DOMAIN,
+)
+
+from . import async_setup_device, async_wait_for
+
+
+async def test_light_follows_device_availability(hass: HomeAssistant, socket_enabled) -> None:
+    """The entity state reflects the device, not the coordinator update."""
+    entry = await async_setup_device(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    coordinator.async_set_updated_data({"available": False})
+    await hass.async_block_till_done()
+    assert hass.states.get("light.strip").state == STATE_UNAVAILABLE
+
+    coordinator.async_set_updated_data({"available": True})
+    await hass.async_block_till_done()
+    assert hass.states.get("light.strip").state != STATE_UNAVAILABLE
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize(
+    ("last_state", "reconciled"),
+    [
+        (STATE_ON, True),
+        (STATE_OFF, True),
+        (STATE_UNAVAILABLE, False),
+        (STATE_UNKNOWN, False),
+    ],
+)
+async def test_reconcile_only_known_state(
+    hass: HomeAssistant, socket_enabled, last_state: str, reconciled: bool
+) -> None:
+    """Only an on or off state from before the restart is sent to the device."""
+    mock_restore_cache(hass, [State("light.strip", last_state, {"brightness": 128})])
+    entry = await async_setup_device(hass, **{CONF_RECONCILE_STATE: True})
+    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+
+    assert (controller.metrics.commands_queued == 1) is reconciled
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_offline_command_is_applied_on_reconnect(hass: HomeAssistant, emulator) -> None:
+    """With queue_offline a turn_on for an absent device is sent when it is back."""
+    device = emulator.devices[0]
+    entry = await async_setup_device(hass, device.ip, device.serial, **{CONF_QUEUE_OFFLINE: True})
+    data = hass.data[DOMAIN][entry.entry_id]
+    device.online = False
+    data["coordinator"].async_set_updated_data({"available": False})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("light.strip")
+    assert state.state != STATE_UNAVAILABLE
+    assert state.attributes[ATTR_REACHABLE] is False
+
+    await hass.services.async_call(
+        LIGHT_DOMAIN, SERVICE_TURN_ON, {"entity_id": "light.strip", "brightness": 255}, blocking=True
+    )
+    assert hass.states.get("light.strip").state == STATE_ON
+    assert not device.control_frames
+
+    device.online = True
+    assert await data["controller"].async_check_availability()
+    data["coordinator"].async_set_updated_data({"available": True})
+    await async_wait_for(lambda: device.control_frames)
+    assert device.brightness == 31
+    assert hass.states.get("light.strip").attributes[ATTR_REACHABLE] is True
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("issued", [0.0, 0.1])
+async def test_trace_starts_at_the_service_call(hass: HomeAssistant, emulator, issued: float) -> None:
+    """The time between the service call and the entity method is a stage of its own."""
+    device = emulator.devices[0]
+    entry = await async_setup_device(hass, device.ip, device.serial, **{CONF_TRACE_COMMANDS: True})
+    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+    hass.data[DOMAIN][entry.entry_id]["coordinator"].async_set_updated_data({"available": True})
+    await hass.async_block_till_done()
+
+    context = Context(id=ulid_at_time(time.time() - issued))
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        SERVICE_TURN_ON,
+        {"entity_id": "light.strip", "brightness": 255},
+        blocking=True,
+        context=context,
+    )
+
+    trace = controller.tracer.recent()[-1]
+    stages = list(trace["stages_ms"])
+    assert stages[:2] == ["dispatch", "available"]
+    assert trace["stages_ms"]["dispatch"] >= issued * 1000
+    assert trace["success"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
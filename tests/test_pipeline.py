@@ -0,0 +1,74 @@
+"""Tests for the latest-wins command pipeline."""
+
+import asyncio
+import time
+
+from custom_components.h806sb.pyh806sb.metrics import ControllerMetrics
+from custom_components.h806sb.pyh806sb.pipeline import CommandPipeline
+
+
+class _FakeController:
+    """Records every command the pipeline sends."""
+
+    def __init__(self, delay: float = 0.0):
+        self.metrics = ControllerMetrics()
+        self.sent: list[tuple[float, tuple]] = []
+        self._delay = delay
+
+    async def async_send_command(self, brightness, speed, is_on, traces=()):
+        self.sent.append((time.monotonic(), (brightness, speed, is_on)))
+        await asyncio.sleep(self._delay)
+        return True
+
+
+async def test_burst_is_coalesced_to_latest() -> None:
+    """A slider drag ends with the newest state, not a backlog."""
+    controller = _FakeController()
+    pipeline = CommandPipeline(controller, min_interval=0.05)
+
+    results = await asyncio.gather(
+        *(pipeline.async_submit(level, 20, True) for level in range(1, 21))
+    )
+
+    assert all(results)
+    assert [state for _, state in controller.sent] == [(20, 20, True)]
+
+
+async def test_min_interval_between_packets() -> None:
+    """Packets are never closer than the configured gap."""
+    controller = _FakeController()
+    pipeline = CommandPipeline(controller, min_interval=0.05)
+
+    for level in range(1, 5):
+        await pipeline.async_submit(level, 20, True)
+
+    times = [at for at, _ in controller.sent]
+    assert len(times) == 4
+    assert all(later - earlier >= 0.05 for earlier, later in zip(times, times[1:]))
+
+
+async def test_unchanged_state_is_not_sent() -> None:
+    """A command matching the last sent state is skipped until reset."""
+    controller = _FakeController()
+    pipeline = CommandPipeline(controller, min_interval=0)
+
+    assert await pipeline.async_submit(31, 20, True)
+    assert await pipeline.async_submit(31, 20, True)
+    assert len(controller.sent) == 1
+
+    pipeline.reset()
+    assert await pipeline.async_submit(31, 20, True)
+    assert len(controller.sent) == 2
+
+
+async def test_commands_during_send_are_merged() -> None:
+    """Commands arriving while a packet is in flight become one more packet."""
+    controller = _FakeController(delay=0.02)
+    pipeline = CommandPipeline(controller, min_interval=0)
+
+    first = asyncio.ensure_future(pipeline.async_submit(1, 20, True))
+    await asyncio.sleep(0.01)
+    later = [pipeline.async_submit(level, 20, True) for level in range(2, 10)]
+
+    assert all(await asyncio.gather(first, *later))
+    assert [state for _, state in controller.sent] == [(1, 20, True), (9, 20, True)]
@@ -0,0 +1,67 @@
+"""Tests for user commands preempting background probes."""
+
+import asyncio
+
+import pytest
+
+from custom_components.h806sb.pyh806sb.controller import LedController
+from custom_components.h806sb.pyh806sb.priority import PriorityGate
+from custom_components.h806sb.pyh806sb.transport import H806SBTransport
+
+from . import RecordingDatagramTransport
+
+
+def test_background_without_command_is_not_preempted() -> None:
+    gate = PriorityGate()
+    token = gate.begin_background()
+
+    assert not gate.busy
+    assert not gate.preempted(token)
+
+
+def test_command_in_flight_preempts() -> None:
+    gate = PriorityGate()
+    token = gate.begin_background()
+
+    with gate.user():
+        assert gate.busy
+        assert gate.preempted(token)
+        # Background work started during the command is stale too
+        assert gate.preempted(gate.begin_background())
+
+    assert not gate.busy
+
+
+@pytest.mark.parametrize("overlap", ["user", "touch"])
+def test_finished_command_still_preempts(overlap) -> None:
+    """A command that started and ended during the probe is detected afterwards."""
+    gate = PriorityGate()
+    token = gate.begin_background()
+    if overlap == "user":
+        with gate.user():
+            pass
+    else:
+        gate.touch()
+
+    assert gate.preempted(token)
+    assert not gate.preempted(gate.begin_background())
+
+
+async def test_overlapped_probe_does_not_mark_lost() -> None:
+    """A probe that timed out while a command was sent leaves availability alone."""
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    controller = LedController("10.0.0.1", transport)
+    lost = []
+    controller.add_availability_listener(lost.append)
+
+    probe = asyncio.ensure_future(controller.async_check_availability(timeout=0.02, attempts=1))
+    await asyncio.sleep(0)
+    controller.priority.touch()
+
+    assert not await probe
+    assert lost == []
+    assert controller.metrics.probes_preempted == 1
+
+    assert not await controller.async_check_availability(timeout=0.02, attempts=1)
+    assert lost == [False]
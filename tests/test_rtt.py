@@ -0,0 +1,44 @@
+"""Tests for the round-trip time estimator."""
+
+import pytest
+
+from custom_components.h806sb.pyh806sb.rtt import INITIAL_RTO, MAX_RTO, MIN_RTO, RttEstimator
+
+
+def test_first_sample() -> None:
+    """RFC 6298 2.2: SRTT = R, RTTVAR = R/2, RTO = SRTT + 4 RTTVAR."""
+    rtt = RttEstimator()
+    assert rtt.rto == INITIAL_RTO
+
+    rtt.sample(0.1)
+
+    assert rtt.srtt == 0.1
+    assert rtt.rttvar == 0.05
+    assert rtt.rto == pytest.approx(0.3)
+
+
+def test_later_samples_are_smoothed() -> None:
+    """RFC 6298 2.3 with alpha 1/8 and beta 1/4."""
+    rtt = RttEstimator()
+    rtt.sample(0.1)
+    rtt.sample(0.2)
+
+    assert rtt.rttvar == pytest.approx(0.75 * 0.05 + 0.25 * 0.1)
+    assert rtt.srtt == pytest.approx(0.875 * 0.1 + 0.125 * 0.2)
+    assert rtt.rto == pytest.approx(rtt.srtt + 4 * rtt.rttvar)
+
+
+def test_rto_bounds_and_backoff() -> None:
+    rtt = RttEstimator()
+    rtt.sample(0.001)
+    assert rtt.rto == MIN_RTO
+
+    rtt.backoff()
+    assert rtt.rto == 2 * MIN_RTO
+    for _ in range(10):
+        rtt.backoff()
+    assert rtt.rto == MAX_RTO
+
+    # A valid sample replaces the backed-off value
+    rtt.sample(0.001)
+    assert rtt.rto == MIN_RTO
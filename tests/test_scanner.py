@@ -0,0 +1,58 @@
+"""Tests for background discovery."""
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.h806sb.const import (
+    DATA_SCANNER,
+    DATA_TRANSPORT,
+    DISCOVERY_INTERVAL,
+    DOMAIN,
+)
+from custom_components.h806sb.scanner import async_scan
+
+
+async def test_scanner_stops_with_last_entry(hass: HomeAssistant, socket_enabled) -> None:
+    """No scans and no open endpoint once the last device is unloaded."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="000c3951",
+        data={"host": "127.0.0.1", "serial_number": "000c3951", "name": "Strip"},
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.h806sb.scanner.async_scan", AsyncMock(return_value=[])) as scan,
+        patch("custom_components.h806sb._PLATFORMS", ["light"]),
+        patch("custom_components.h806sb.coordinator.H806SBFleet._async_sweep"),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert scan.call_count == 1
+        assert DATA_SCANNER in hass.data
+
+        async_fire_time_changed(hass, dt_util.utcnow() + DISCOVERY_INTERVAL)
+        await hass.async_block_till_done()
+        assert scan.call_count == 2
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert DATA_SCANNER not in hass.data
+        assert DATA_TRANSPORT not in hass.data
+
+        async_fire_time_changed(hass, dt_util.utcnow() + 2 * DISCOVERY_INTERVAL)
+        await hass.async_block_till_done()
+        assert scan.call_count == 2
+
+
+async def test_scan_without_entries_closes_endpoint(hass: HomeAssistant, socket_enabled) -> None:
+    """A scan from the config flow does not keep port 4882 open."""
+    with patch(
+        "custom_components.h806sb.scanner.async_get_broadcast_addresses",
+        return_value=["127.255.255.255"],
+    ):
+        assert await async_scan(hass, timeout=0.01) == []
+
+    assert DATA_TRANSPORT not in hass.data
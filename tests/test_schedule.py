@@ -0,0 +1,49 @@
+"""Tests for the per-device probe schedule."""
+
+import time
+
+from custom_components.h806sb.pyh806sb.schedule import ProbeSchedule, spread_phase
+
+
+def _schedule(**kwargs) -> ProbeSchedule:
+    return ProbeSchedule(interval=30, fast_interval=10, max_interval=60, **kwargs)
+
+
+def test_stable_device_backs_off_to_max() -> None:
+    schedule = _schedule()
+    for _ in range(10):
+        schedule.probed(True)
+        assert schedule.next_due - time.monotonic() <= 60
+
+    assert schedule.interval == 60
+
+
+def test_dead_device_backs_off_exponentially() -> None:
+    """A device that keeps failing is probed less and less, up to a cap."""
+    schedule = _schedule(max_failed_interval=300)
+    intervals = []
+    for _ in range(8):
+        schedule.probed(False)
+        intervals.append(schedule.interval)
+        assert schedule.next_due - time.monotonic() <= 300
+
+    assert intervals == [10, 20, 40, 80, 160, 300, 300, 300]
+
+
+def test_device_back_polls_fast() -> None:
+    schedule = _schedule()
+    for _ in range(5):
+        schedule.probed(False)
+
+    schedule.seen()
+    assert schedule.failures == 0
+    assert schedule.interval == 10
+
+    schedule.probed(False)
+    assert schedule.interval == 10
+
+
+def test_phases_are_spread() -> None:
+    phases = sorted(spread_phase(index) for index in range(10))
+
+    assert all(later - earlier > 0.05 for earlier, later in zip(phases, phases[1:]))
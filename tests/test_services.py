@@ -0,0 +1,102 @@
+"""Tests for the group services."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.h806sb.const import DOMAIN, SERVICE_APPLY_SCENE, SERVICE_SET_MANY
+
+from . import async_setup_device, async_wait_for
+
+
+async def _async_setup_fleet(hass: HomeAssistant, emulator) -> list[str]:
+    """An entry per emulated device, plus one that is unavailable; their entity ids."""
+    entity_ids = []
+    for index, device in enumerate(emulator.devices):
+        entry = await async_setup_device(hass, device.ip, device.serial, f"Strip {index}")
+        hass.data[DOMAIN][entry.entry_id]["coordinator"].async_set_updated_data({"available": True})
+        entity_ids.append(f"light.strip_{index}")
+    entry = await async_setup_device(hass, "127.1.0.250", "0cffff", "Gone")
+    hass.data[DOMAIN][entry.entry_id]["coordinator"].async_set_updated_data({"available": False})
+    await hass.async_block_till_done()
+    return entity_ids
+
+
+async def _async_unload_all(hass: HomeAssistant) -> None:
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_set_many_reports_every_light(hass: HomeAssistant, emulator) -> None:
+    """One packet per available light and a result for every requested entity."""
+    entity_ids = await _async_setup_fleet(hass, emulator)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_MANY,
+        {"entity_id": [*entity_ids, "light.gone", "light.missing"], "brightness": 255},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    results = response["results"]
+    for entity_id in entity_ids:
+        assert results[entity_id]["success"]
+        assert hass.states.get(entity_id).state == "on"
+    assert results["light.gone"] == {"success": False, "error": "unavailable"}
+    assert results["light.missing"] == {"success": False, "error": "unknown_entity"}
+    await async_wait_for(lambda: all(device.control_frames for device in emulator.devices))
+    for device in emulator.devices:
+        assert len(device.control_frames) == 1
+        assert device.brightness == 31
+
+    await _async_unload_all(hass)
+
+
+async def test_apply_scene_reports_timing(hass: HomeAssistant, emulator) -> None:
+    """Staged packets go out together; the response says how late and how spread."""
+    entity_ids = await _async_setup_fleet(hass, emulator)
+    scene = {entity_id: {"brightness": 255} for entity_id in entity_ids}
+    scene["light.strip_1"] = {"state": False}
+    scene["light.gone"] = {}
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_APPLY_SCENE,
+        {"entities": scene, "delay": 0.05},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    results = response["results"]
+    offsets = [results[entity_id]["offset_ms"] for entity_id in entity_ids]
+    assert results["light.gone"] == {"success": False, "error": "unavailable"}
+    assert response["late_ms"] == min(offsets)
+    assert response["skew_ms"] == round(max(offsets) - min(offsets), 3)
+    assert 0 <= response["skew_ms"] < 50
+    assert hass.states.get("light.strip_0").state == "on"
+    assert hass.states.get("light.strip_1").state == "off"
+    await async_wait_for(lambda: all(device.control_frames for device in emulator.devices))
+    assert [device.brightness for device in emulator.devices] == [31, 0]
+
+    await _async_unload_all(hass)
+
+
+async def test_apply_scene_without_reachable_lights(hass: HomeAssistant, emulator) -> None:
+    await _async_setup_fleet(hass, emulator)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_APPLY_SCENE,
+        {"entities": {"light.gone": {}}},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "results": {"light.gone": {"success": False, "error": "unavailable"}},
+        "late_ms": None,
+        "skew_ms": None,
+    }
+    await _async_unload_all(hass)
@@ -0,0 +1,35 @@
+"""Tests for the brightness ramp planner."""
+
+import pytest
+
+from custom_components.h806sb.pyh806sb.transition import PERCEPTUAL_CURVE, plan_transition
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "duration", "min_interval"),
+    [
+        (0, 255, 1.0, 0.05),
+        (255, 0, 1.0, 0.05),
+        (0, 255, 10.0, 0.05),
+        (40, 200, 0.3, 0.1),
+        (255, 1, 2.0, 0.15),
+        (10, 12, 5.0, 0.05),
+    ],
+)
+def test_plan_transition(start: int, end: int, duration: float, min_interval: float) -> None:
+    """Steps are ordered, spaced and end on the target at the full duration."""
+    steps = plan_transition(start, end, duration, min_interval)
+    offsets = [offset for offset, _ in steps]
+
+    assert offsets == sorted(offsets)
+    assert steps[-1] == (duration, PERCEPTUAL_CURVE[end])
+    assert all(later - earlier >= min_interval for earlier, later in zip(offsets, offsets[1:]))
+    for offset, level in steps:
+        # Each level is the one the ramp has reached at its own offset
+        brightness = round(start + (end - start) * offset / duration)
+        assert level == PERCEPTUAL_CURVE[brightness]
+
+
+def test_plan_transition_without_duration() -> None:
+    """No duration sends the target at once."""
+    assert plan_transition(0, 255, 0, 0.05) == [(0.0, PERCEPTUAL_CURVE[255])]
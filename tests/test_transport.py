@@ -0,0 +1,76 @@
+"""Tests for reply routing on the shared endpoint."""
+
+from custom_components.h806sb.pyh806sb.codec import PROBE_PACKET
+from custom_components.h806sb.pyh806sb.transport import DEVICE_PORT, H806SBTransport
+
+from . import RecordingDatagramTransport
+
+
+def _reply(serial: str) -> bytes:
+    return b"\xab\x02" + f"H806SB_{serial}".encode() + b"\x00"
+
+
+async def test_replies_are_routed_by_host() -> None:
+    """Each waiter only gets the datagram of its own device."""
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    first = transport.register_waiter("10.0.0.1")
+    second = transport.register_waiter("10.0.0.2")
+
+    transport.datagram_received(_reply("0c0001"), ("10.0.0.2", DEVICE_PORT))
+
+    assert not first.done()
+    assert second.result()[1][0] == "10.0.0.2"
+
+
+async def test_replies_are_routed_by_serial() -> None:
+    """A device answering from a new address still reaches its waiter."""
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    waiter = transport.register_waiter("10.0.0.1", "000C0001")
+
+    transport.datagram_received(_reply("000c0001"), ("10.0.0.9", DEVICE_PORT))
+
+    assert waiter.result()[1][0] == "10.0.0.9"
+
+
+async def test_host_listener_only_hears_its_host() -> None:
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    heard = []
+    remove = transport.add_host_listener("10.0.0.1", lambda data, addr: heard.append(addr[0]))
+
+    transport.datagram_received(_reply("0c0001"), ("10.0.0.1", DEVICE_PORT))
+    transport.datagram_received(_reply("0c0002"), ("10.0.0.2", DEVICE_PORT))
+    remove()
+    transport.datagram_received(_reply("0c0001"), ("10.0.0.1", DEVICE_PORT))
+
+    assert heard == ["10.0.0.1"]
+
+
+async def test_request_many_through_one_socket(emulator, transport) -> None:
+    """Probes to several devices share the endpoint and all get their reply."""
+    devices = emulator.devices
+    replies = await transport.async_request_many(
+        [(PROBE_PACKET, (device.ip, DEVICE_PORT), None) for device in devices], 1
+    )
+
+    assert [reply.addr[0] for reply in replies] == [device.ip for device in devices]
+    assert all(device.probes == 1 for device in devices)
+
+
+async def test_one_reply_answers_one_waiter() -> None:
+    """Concurrent probes of a device each need their own reply, oldest first."""
+    transport = H806SBTransport()
+    transport.connection_made(RecordingDatagramTransport())
+    first = transport.register_waiter("10.0.0.1")
+    second = transport.register_waiter("10.0.0.1")
+
+    transport.datagram_received(_reply("0c0001"), ("10.0.0.1", DEVICE_PORT))
+    assert first.done() and not second.done()
+
+    transport.datagram_received(b"\xfb\xc1" + bytes(14), ("10.0.0.1", DEVICE_PORT))
+    assert not second.done()
+
+    transport.datagram_received(_reply("0c0001"), ("10.0.0.1", DEVICE_PORT))
+    assert second.done()
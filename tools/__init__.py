@@ -0,0 +1,9 @@
+"""Development tools for the H806SB integration (not shipped)."""
+
+import sys
+from pathlib import Path
+
+# The tools use the protocol package on its own, without Home Assistant
+_PACKAGE_PARENT = str(Path(__file__).resolve().parent.parent / "custom_components" / "h806sb")
+if _PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, _PACKAGE_PARENT)
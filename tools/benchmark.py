@@ -0,0 +1,237 @@
+"""Benchmarks of the H806SB hot paths against the loopback emulator.
+
+Measures:
+  * turn_on_latency   H806SBLight.async_turn_on until the frame reaches the device
+  * send_packet_rate  packets per second from LedController.async_send_packet
+  * sweep_wall_time   fleet availability sweep as the device count grows
+  * discovery_time    H806SBDiscovery until every device has been reported
+
+Results are written as JSON in the layout of pytest-benchmark
+(``benchmarks[].stats`` with min/max/mean/median/stddev/rounds), so a run
+can be stored as a baseline and compared later:
+
+    python -m tools.benchmark --output baseline.json
+    python -m tools.benchmark --compare baseline.json --threshold 0.25
+
+turn_on_latency needs Home Assistant importable for the light entity and
+is skipped without it; the others only use the HA-free pyh806sb package.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+from pyh806sb.controller import (
+    LedController,
+    async_check_availability_many,
+)
+from pyh806sb.discovery import H806SBDiscovery
+from pyh806sb.transport import H806SBTransport
+
+from .emulator import DeviceEmulator, Impairments
+
+# Port of the integration's endpoint during benchmarks (4882 may be in use)
+BENCH_LISTEN_PORT = 14882
+
+
+def _stats(samples: list[float]) -> dict:
+    return {
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": len(samples),
+    }
+
+
+def _result(name: str, group: str, samples: list[float], unit: str = "s", **params) -> dict:
+    return {
+        "name": name,
+        "group": group,
+        "params": params,
+        "unit": unit,
+        "stats": _stats(samples),
+    }
+
+
+async def _async_wait_for_frames(device, count: int, timeout: float = 1.0) -> Optional[float]:
+    """Wait until the device has recorded count control frames; return the last timestamp."""
+    deadline = time.monotonic() + timeout
+    while len(device.control_frames) < count:
+        if time.monotonic() > deadline:
+            return None
+        await asyncio.sleep(0)
+    return device.control_frames[count - 1].timestamp
+
+
+async def bench_turn_on_latency(transport: H806SBTransport, rounds: int) -> dict:
+    from custom_components.h806sb.light import H806SBLight
+
+    async with DeviceEmulator(1, discovery_host=None) as emulator:
+        device = emulator.devices[0]
+        controller = LedController(device.ip, transport, min_command_interval=0)
+        controller.set_serial_number(device.serial)
+        coordinator = SimpleNamespace(
+            data={"available": True},
+            last_update_success=True,
+            async_note_command=lambda: None,
+        )
+        light = H806SBLight(coordinator, controller, {"host": device.ip, "name": "bench"})
+        light._attr_available = True
+        # No hass instance: state writes are not part of the measured path
+        light.async_write_ha_state = lambda: None
+
+        samples = []
+        for i in range(rounds):
+            start = time.monotonic()
+            # Alternate levels so the pipeline never skips an unchanged state
+            await light.async_turn_on(brightness=128 if i % 2 else 255)
+            arrived = await _async_wait_for_frames(device, i + 1)
+            if arrived is not None:
+                samples.append(arrived - start)
+        await controller.async_close()
+    return _result("turn_on_latency", "command", samples, rounds=rounds)
+
+
+async def bench_send_packet_rate(transport: H806SBTransport, packets: int, rounds: int) -> dict:
+    async with DeviceEmulator(1, discovery_host=None) as emulator:
+        device = emulator.devices[0]
+        controller = LedController(device.ip, transport)
+        samples = []
+        for _ in range(rounds):
+            start = time.monotonic()
+            for i in range(packets):
+                await controller.async_send_packet(i % 32, 20, True)
+            samples.append(packets / (time.monotonic() - start))
+    return _result("send_packet_rate", "command", samples, unit="packets/s", packets=packets)
+
+
+async def bench_sweep(transport: H806SBTransport, devices: int, latency: float, rounds: int) -> dict:
+    async with DeviceEmulator(
+        devices, discovery_host=None, impairments=Impairments(latency=latency)
+    ) as emulator:
+        controllers = []
+        for device in emulator.devices:
+            controller = LedController(device.ip, transport)
+            controller.set_serial_number(device.serial)
+            controllers.append(controller)
+        samples = []
+        answered = []
+        for _ in range(rounds):
+            start = time.monotonic()
+            results = await async_check_availability_many(controllers)
+            samples.append(time.monotonic() - start)
+            answered.append(sum(results))
+    result = _result("sweep_wall_time", "availability", samples, devices=devices, latency=latency)
+    result["extra_info"] = {"answered_min": min(answered)}
+    return result
+
+
+async def bench_discovery(transport: H806SBTransport, devices: int, rounds: int) -> dict:
+    async with DeviceEmulator(devices, discovery_host="127.0.0.1") as emulator:
+        discovery = H806SBDiscovery(transport, broadcast_address="127.0.0.1")
+        samples = []
+        for _ in range(rounds):
+            start = time.monotonic()
+            found = 0
+            devices_found = discovery.async_discover(timeout=2.0)
+            try:
+                async for _device in devices_found:
+                    found += 1
+                    if found == len(emulator.devices):
+                        break
+            finally:
+                await devices_found.aclose()
+            samples.append(time.monotonic() - start)
+    return _result("discovery_time", "discovery", samples, devices=devices)
+
+
+async def async_run(args) -> list[dict]:
+    transport = H806SBTransport(args.listen_port)
+    await transport.async_start()
+    try:
+        results = []
+        try:
+            results.append(await bench_turn_on_latency(transport, args.rounds * 10))
+        except ImportError as err:
+            print(f"turn_on_latency skipped: {err}", file=sys.stderr)
+        results.append(await bench_send_packet_rate(transport, 1000, args.rounds))
+        for devices in args.devices:
+            results.append(await bench_sweep(transport, devices, args.latency, args.rounds))
+        for devices in args.devices:
+            results.append(await bench_discovery(transport, devices, args.rounds))
+    finally:
+        transport.close()
+    return results
+
+
+def _key(result: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Return a line per benchmark that regressed by more than threshold."""
+    previous = {_key(result): result for result in baseline["benchmarks"]}
+    regressions = []
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        new_mean, old_mean = result["stats"]["mean"], old["stats"]["mean"]
+        # Rates regress when they go down, durations when they go up
+        if result["unit"].endswith("/s"):
+            change = (old_mean - new_mean) / old_mean
+        else:
+            change = (new_mean - old_mean) / old_mean
+        if change > threshold:
+            regressions.append(f"{_key(result)}: {old_mean:.6g} -> {new_mean:.6g} {result['unit']} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--latency", type=float, default=0.005, help="emulated one-way latency, s")
+    parser.add_argument("--listen-port", type=int, default=BENCH_LISTEN_PORT)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run(args))
+    report = {
+        "machine_info": {
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "benchmarks": results,
+    }
+    for result in results:
+        stats = result["stats"]
+        print(f"{_key(result):55} mean {stats['mean']:.6g} median {stats['median']:.6g} "
+              f"max {stats['max']:.6g} {result['unit']}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Loopback emulator of H806SB controllers.
+
+Each emulated device listens on its own loopback address, port 4626, and
+answers probes (0xAB 0x01 ...) with a 0xAB 0x02 name/serial reply, the way
+the real controller does. Control frames (0xFB 0xC1) are recorded and
+applied to the device state. A shared listener on the discovery address
+makes every device answer a discovery broadcast.
+
+Impairments (latency, jitter, loss, duplication, reordering) are applied
+to every datagram the emulator receives or sends, so production timeouts
+and availability flapping can be reproduced on a laptop:
+
+    python -m tools.emulator --devices 200 --latency 0.05 --loss 0.1
+
+Point the integration at 127.1.0.1... (device IPs) and run discovery
+against ``--discovery-host`` (127.0.0.1 by default).
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import socket
+import time
+from dataclasses import dataclass, field
+from ipaddress import IPv4Address
+from typing import Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_PORT = 4626
+CONTROL_HEADER = b"\xfb\xc1"
+PROBE_HEADER = b"\xab\x01"
+REPLY_HEADER = b"\xab\x02"
+REPLY_SIZE = 32
+
+
+@dataclass
+class Impairments:
+    """Network conditions applied to every emulated datagram."""
+
+    latency: float = 0.0      # one-way delay, seconds
+    jitter: float = 0.0       # uniform extra delay 0..jitter, seconds
+    loss: float = 0.0         # probability a datagram is dropped
+    duplicate: float = 0.0    # probability a reply is sent twice
+    reorder: float = 0.0      # probability a reply is held back
+    reorder_delay: float = 0.05
+
+    def delay(self, rng: random.Random) -> float:
+        delay = self.latency + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.reorder and rng.random() < self.reorder:
+            delay += self.reorder_delay
+        return delay
+
+
+@dataclass
+class ReceivedFrame:
+    timestamp: float
+    source: Tuple[str, int]
+    data: bytes
+
+
+@dataclass
+class EmulatedDevice:
+    """State and traffic log of one emulated controller."""
+
+    ip: str
+    serial: str
+    name: str = ""
+    online: bool = True
+    counter: int = 0
+    speed: int = 0x20
+    brightness: int = 0
+    is_on: bool = False
+    frames: list[ReceivedFrame] = field(default_factory=list)
+    probes: int = 0
+
+    def __post_init__(self):
+        if not self.name:
+            self.name = f"H806SB_{self.serial}"
+
+    @property
+    def reply(self) -> bytes:
+        return (REPLY_HEADER + self.name.encode("ascii")).ljust(REPLY_SIZE, b"\x00")
+
+    @property
+    def control_frames(self) -> list[ReceivedFrame]:
+        return [frame for frame in self.frames if frame.data.startswith(CONTROL_HEADER)]
+
+    def apply(self, data: bytes):
+        """Apply a control frame to the device state."""
+        if len(data) < 6:
+            return
+        self.counter = data[2]
+        self.speed = data[3]
+        self.brightness = data[4]
+        self.is_on = bool(data[5])
+
+
+class _DeviceProtocol(asyncio.DatagramProtocol):
+    def __init__(self, emulator: "DeviceEmulator", devices: list[EmulatedDevice]):
+        self._emulator = emulator
+        self._devices = devices
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        self._emulator._on_datagram(self._devices, data, addr)
+
+
+class DeviceEmulator:
+    """A fleet of emulated devices on loopback."""
+
+    def __init__(
+        self,
+        count: int = 1,
+        base_ip: str = "127.1.0.1",
+        discovery_host: Optional[str] = "127.0.0.1",
+        impairments: Optional[Impairments] = None,
+        seed: Optional[int] = None,
+        port: int = DEVICE_PORT,
+    ):
+        base = IPv4Address(base_ip)
+        self.devices = [
+            EmulatedDevice(ip=str(base + i), serial=f"{0x0C0000 + i:06x}")
+            for i in range(count)
+        ]
+        self._by_ip = {device.ip: device for device in self.devices}
+        self.impairments = impairments or Impairments()
+        self._discovery_host = discovery_host
+        self._port = port
+        self._rng = random.Random(seed)
+        self._protocols: dict[str, _DeviceProtocol] = {}
+        self._transports: list[asyncio.DatagramTransport] = []
+        self._handles: set[asyncio.TimerHandle] = set()
+
+    def device(self, ip: str) -> Optional[EmulatedDevice]:
+        return self._by_ip.get(ip)
+
+    async def async_start(self):
+        loop = asyncio.get_running_loop()
+        for device in self.devices:
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda device=device: _DeviceProtocol(self, [device]),
+                sock=self._bind(device.ip),
+            )
+            self._protocols[device.ip] = protocol
+            self._transports.append(transport)
+        if self._discovery_host:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DeviceProtocol(self, self.devices),
+                sock=self._bind(self._discovery_host),
+            )
+            self._transports.append(transport)
+
+    def _bind(self, host: str) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setblocking(False)
+        sock.bind((host, self._port))
+        return sock
+
+    def close(self):
+        for handle in self._handles:
+            handle.cancel()
+        self._handles.clear()
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+        self._protocols.clear()
+
+    async def __aenter__(self):
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def flap(self, ip: str, offline: float, online: float):
+        """Toggle a device offline/online forever (cancelled by close)."""
+        device = self.device(ip)
+
+        def toggle():
+            device.online = not device.online
+            self._later(offline if not device.online else online, toggle)
+
+        self._later(online, toggle)
+
+    def _later(self, delay: float, callback, *args):
+        loop = asyncio.get_running_loop()
+        handle = None
+
+        def run():
+            self._handles.discard(handle)
+            callback(*args)
+
+        handle = loop.call_later(delay, run)
+        self._handles.add(handle)
+
+    def _on_datagram(self, devices, data: bytes, addr):
+        impairments = self.impairments
+        if impairments.loss and self._rng.random() < impairments.loss:
+            return
+        delay = impairments.delay(self._rng)
+        if delay > 0:
+            self._later(delay, self._handle, devices, data, addr)
+        else:
+            self._handle(devices, data, addr)
+
+    def _handle(self, devices, data: bytes, addr):
+        now = time.monotonic()
+        for device in devices:
+            if not device.online:
+                continue
+            device.frames.append(ReceivedFrame(now, addr, data))
+            if data.startswith(CONTROL_HEADER):
+                device.apply(data)
+            elif data.startswith(PROBE_HEADER):
+                device.probes += 1
+                self._reply(device, addr)
+
+    def _reply(self, device: EmulatedDevice, addr):
+        impairments = self.impairments
+        copies = 2 if impairments.duplicate and self._rng.random() < impairments.duplicate else 1
+        for _ in range(copies):
+            if impairments.loss and self._rng.random() < impairments.loss:
+                continue
+            delay = impairments.delay(self._rng)
+            if delay > 0:
+                self._later(delay, self._send, device, addr)
+            else:
+                self._send(device, addr)
+
+    def _send(self, device: EmulatedDevice, addr):
+        protocol = self._protocols.get(device.ip)
+        if protocol is not None and protocol.transport is not None:
+            protocol.transport.sendto(device.reply, addr)
+
+
+async def _async_main(args):
+    emulator = DeviceEmulator(
+        count=args.devices,
+        base_ip=args.base_ip,
+        discovery_host=args.discovery_host,
+        impairments=Impairments(
+            latency=args.latency,
+            jitter=args.jitter,
+            loss=args.loss,
+            duplicate=args.duplicate,
+            reorder=args.reorder,
+        ),
+        seed=args.seed,
+    )
+    async with emulator:
+        for device in emulator.devices:
+            if args.flap:
+                emulator.flap(device.ip, args.flap, args.flap)
+        print(f"{len(emulator.devices)} devices: {emulator.devices[0].ip} .. {emulator.devices[-1].ip}")
+        while True:
+            await asyncio.sleep(args.report)
+            frames = sum(len(device.control_frames) for device in emulator.devices)
+            probes = sum(device.probes for device in emulator.devices)
+            print(f"control frames: {frames}, probes: {probes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--base-ip", default="127.1.0.1")
+    parser.add_argument("--discovery-host", default="127.0.0.1")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--duplicate", type=float, default=0.0)
+    parser.add_argument("--reorder", type=float, default=0.0)
+    parser.add_argument("--flap", type=float, default=0.0, help="toggle online every N seconds")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--report", type=float, default=10.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
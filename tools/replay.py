@@ -0,0 +1,282 @@
+"""Offline replay of a packet capture taken by the integration.
+
+The outgoing traffic of the capture is turned back into the calls that
+produced it: a burst of probes starts async_check_availability_many for
+the probed devices, a control frame a send through LedController
+(confirmed when a probe to the same device follows it). Those run the
+production code against the shared transport, while the recorded replies
+are fed into the transport's routing at their recorded times. The event
+loop runs on a virtual clock that jumps from one timer to the next, so
+the windows, retries, RTT estimator and availability listeners behave
+exactly as they did on the wire, and a field capture shows when and why
+a device would have been marked unavailable:
+
+    python -m tools.replay capture.jsonl
+    python -m tools.replay config_entry-h806sb-....json --speed 1
+
+The input is either a JSONL export or the diagnostics download that
+contains one (``capture.jsonl``). With --speed the virtual clock is
+slowed to real time divided by that factor, otherwise it runs as fast as
+possible. Frames the code sends are printed with >>, recorded replies
+with <<.
+
+Only needs the HA-free pyh806sb package, which tools/__init__.py puts on
+the path.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Optional
+
+from pyh806sb.capture import DIRECTION_OUT, CapturedFrame, load_jsonl
+from pyh806sb.codec import PROBE_HEADER, Control, parse_control, parse_reply
+from pyh806sb.controller import LedController, async_check_availability_many
+from pyh806sb.transport import LISTEN_PORT, H806SBTransport
+
+# Recorded datagrams closer than this were sent by one call
+BURST_GAP = 0.05
+
+
+def load_capture(path: str) -> list[CapturedFrame]:
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    if text.lstrip().startswith("{") and '"capture"' in text:
+        document = json.loads(text)
+        capture = document.get("data", document).get("capture") or {}
+        text = capture.get("jsonl", "")
+    return sorted(load_jsonl(text.splitlines()), key=lambda frame: frame.timestamp)
+
+
+def describe(frame: CapturedFrame) -> str:
+    data = frame.data
+    if (control := parse_control(data)) is not None:
+        return (
+            f"control #{control.counter} brightness={control.brightness} "
+            f"speed={control.speed} {'on' if control.is_on else 'off'}"
+        )
+    if (reply := parse_reply(data)) is not None:
+        return f"reply {reply.name}"
+    if data.startswith(PROBE_HEADER):
+        return "discovery" if len(data) == len(PROBE_HEADER) else "probe"
+    return f"unknown {data.hex()}"
+
+
+def _is_probe(frame: CapturedFrame) -> bool:
+    return frame.data.startswith(PROBE_HEADER) and len(frame.data) > len(PROBE_HEADER)
+
+
+def plan(frames: list[CapturedFrame]) -> list[tuple[float, str, tuple]]:
+    """Calls that produced the outgoing frames: (time, "command" or "sweep", arguments)."""
+    outgoing = [frame for frame in frames if frame.direction == DIRECTION_OUT]
+    used: set[int] = set()
+    calls = []
+    counters: dict[str, int] = {}
+    # Control frames first, so their confirmation probes are not taken for a sweep
+    for index, frame in enumerate(outgoing):
+        if (control := parse_control(frame.data)) is None:
+            continue
+        used.add(index)
+        confirmed = False
+        for other_index in range(index + 1, len(outgoing)):
+            other = outgoing[other_index]
+            if other.timestamp - frame.timestamp > BURST_GAP:
+                break
+            if other_index not in used and _is_probe(other) and other.addr[0] == frame.addr[0]:
+                used.add(other_index)
+                confirmed = True
+                break
+        # Same counter again: a retry or the resend after a reply, made by the code
+        if counters.get(frame.addr[0]) == control.counter:
+            continue
+        counters[frame.addr[0]] = control.counter
+        calls.append((frame.timestamp, "command", (frame.addr[0], control, confirmed)))
+    for index, frame in enumerate(outgoing):
+        if index in used or not _is_probe(frame):
+            continue
+        hosts, last = [frame.addr[0]], frame.timestamp
+        for other_index in range(index + 1, len(outgoing)):
+            other = outgoing[other_index]
+            if other.timestamp - last > BURST_GAP:
+                break
+            if other_index not in used and _is_probe(other) and other.addr[0] not in hosts:
+                used.add(other_index)
+                hosts.append(other.addr[0])
+                last = other.timestamp
+        calls.append((frame.timestamp, "sweep", (hosts,)))
+    return sorted(calls, key=lambda call: call[0])
+
+
+_real_sleep = time.sleep
+
+
+class VirtualClock:
+    """Stand-in for time.monotonic() that only moves when the loop would wait."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _VirtualSelector:
+    """Selector that advances the virtual clock instead of blocking."""
+
+    def __init__(self, selector, clock: VirtualClock, speed: float):
+        self._selector = selector
+        self._clock = clock
+        self._speed = speed
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout:
+            if self._speed:
+                _real_sleep(timeout / self._speed)
+            self._clock.now += timeout
+        return self._selector.select(0)
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class _NullDatagramTransport(asyncio.DatagramTransport):
+    """Socket stand-in: what the code sends is only printed."""
+
+    def __init__(self, replay: "Replay"):
+        super().__init__()
+        self._replay = replay
+
+    def sendto(self, data, addr=None):
+        self._replay.log(addr[0], f">> {describe(CapturedFrame(0, DIRECTION_OUT, addr, bytes(data)))}")
+
+    def is_closing(self) -> bool:
+        return False
+
+    def get_extra_info(self, name, default=None):
+        return ("0.0.0.0", LISTEN_PORT) if name == "sockname" else default
+
+
+class Replay:
+    """Availability and RTT state of every device seen in a capture."""
+
+    def __init__(self, start: float):
+        self.transport = H806SBTransport()
+        self.transport.connection_made(_NullDatagramTransport(self))
+        self.controllers: dict[str, LedController] = {}
+        self.available: dict[str, Optional[bool]] = {}
+        # Hosts with a replayed call in flight: their recorded resends are the code's to make
+        self.busy: set[str] = set()
+        self.tasks: list[asyncio.Task] = []
+        self.start = start
+
+    def controller(self, host: str) -> LedController:
+        if (controller := self.controllers.get(host)) is None:
+            controller = self.controllers[host] = LedController(host, self.transport)
+            self.available[host] = None
+            controller.add_availability_listener(
+                lambda available, host=host: self._on_availability(host, available)
+            )
+        return controller
+
+    def log(self, host: str, message: str):
+        print(f"{time.monotonic() - self.start:+10.3f}s {host:<15} {message}")
+
+    def _on_availability(self, host: str, available: bool):
+        # Same change detection as the coordinator
+        if self.available[host] != available:
+            self.available[host] = available
+            self.log(host, "AVAILABLE" if available else "UNAVAILABLE")
+
+    def _run(self, hosts: list[str], coro):
+        self.busy.update(hosts)
+        task = asyncio.get_running_loop().create_task(coro)
+        task.add_done_callback(lambda _: self.busy.difference_update(hosts))
+        self.tasks.append(task)
+
+    def sweep(self, hosts: list[str]):
+        # Hosts still in a running sweep: this burst is its second round
+        if hosts := [host for host in hosts if host not in self.busy]:
+            self._run(hosts, async_check_availability_many([self.controller(host) for host in hosts]))
+
+    def command(self, host: str, control: Control, confirmed: bool):
+        if host in self.busy:
+            # Resent by a confirmation still in flight
+            return
+        controller = self.controller(host)
+        if any(control.serial):
+            controller.set_serial_number(control.serial[::-1].hex())
+        # The code sends the next counter value, as recorded
+        controller._command_counter = control.counter - 1
+        send = controller.async_send_confirmed if confirmed else controller.async_send_packet
+        self._run([host], send(control.brightness, control.speed, control.is_on))
+
+    def receive(self, frame: CapturedFrame):
+        self.log(frame.addr[0], f"<< {describe(frame)}")
+        self.controller(frame.addr[0])
+        # Routed exactly like a live datagram
+        self.transport.datagram_received(frame.data, frame.addr)
+
+    async def async_run(self, frames: list[CapturedFrame]):
+        loop = asyncio.get_running_loop()
+        for frame in frames:
+            if frame.direction != DIRECTION_OUT:
+                loop.call_at(frame.timestamp, self.receive, frame)
+        for when, kind, arguments in plan(frames):
+            loop.call_at(when, getattr(self, kind), *arguments)
+        await asyncio.sleep(frames[-1].timestamp - loop.time() + BURST_GAP)
+        while pending := [task for task in self.tasks if not task.done()]:
+            await asyncio.wait(pending)
+
+    def summary(self) -> dict:
+        return {
+            host: {
+                "available": self.available[host],
+                "srtt": controller.rtt.srtt,
+                "rto": controller.rtt.rto,
+                "metrics": controller.metrics.as_dict(),
+            }
+            for host, controller in self.controllers.items()
+        }
+
+
+def replay(frames: list[CapturedFrame], speed: float = 0) -> Replay:
+    """Replay frames on a virtual clock starting at the first one."""
+    clock = VirtualClock(frames[0].timestamp)
+    real_monotonic = time.monotonic
+    # The transport, RTT timing and the event loop all read time.monotonic()
+    time.monotonic = clock
+    loop = asyncio.SelectorEventLoop()
+    loop._selector = _VirtualSelector(loop._selector, clock, speed)
+    try:
+        result = Replay(clock.now)
+        loop.run_until_complete(result.async_run(frames))
+        return result
+    finally:
+        loop.close()
+        time.monotonic = real_monotonic
+
+
+def _main(args) -> int:
+    frames = load_capture(args.capture)
+    if args.host:
+        frames = [frame for frame in frames if frame.addr[0] == args.host]
+    if not frames:
+        print("No frames in capture", file=sys.stderr)
+        return 1
+
+    print(json.dumps(replay(frames, args.speed).summary(), indent=2))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="JSONL export or diagnostics JSON")
+    parser.add_argument("--host", help="only replay frames of this device")
+    parser.add_argument("--speed", type=float, default=0, help="real-time factor (0: no waiting)")
+    return _main(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())